@@ -26,7 +26,10 @@ import textwrap
 from typing import Union
 
 from bqflow.util.configuration import Configuration
-from bqflow.util.discovery_to_bigquery import Discovery_To_BigQuery
+from bqflow.util.discovery_to_bigquery import (
+    DISCOVERY_CACHE_DIR,
+    Discovery_To_BigQuery,
+)
 from bqflow.util.google_api import API
 
 
@@ -143,6 +146,11 @@ def main():
       help='return resource as BigQuery structure, function = [resource]',
       action='store_true',
   )
+  parser.add_argument(
+      '--discovery_cache',
+      help='optional, directory to keep discovery documents between runs',
+      default=DISCOVERY_CACHE_DIR,
+  )
 
   parser.add_argument(
       '--key', '-k', help='API Key of Google Cloud Project.', default=None
@@ -188,9 +196,9 @@ def main():
   if args.object:
     print(
         json.dumps(
-            Discovery_To_BigQuery(args.api, args.version).resource_json(
-                args.function
-            ),
+            Discovery_To_BigQuery(
+                args.api, args.version, cache_dir=args.discovery_cache
+            ).resource_json(args.function),
             indent=2,
             default=str,
         )
@@ -200,27 +208,27 @@ def main():
     print(
         '\n'.join(
             flatten_json(
-                Discovery_To_BigQuery(args.api, args.version).resource_json(
-                    args.function
-                )
+                Discovery_To_BigQuery(
+                    args.api, args.version, cache_dir=args.discovery_cache
+                ).resource_json(args.function)
             )
         )
     )
 
   elif args.struct:
     print(
-        Discovery_To_BigQuery(args.api, args.version).resource_struct(
-            args.function
-        )
+        Discovery_To_BigQuery(
+            args.api, args.version, cache_dir=args.discovery_cache
+        ).resource_struct(args.function)
     )
 
   # show schema
   elif args.schema:
     print(
         json.dumps(
-            Discovery_To_BigQuery(args.api, args.version).method_schema(
-                args.function
-            ),
+            Discovery_To_BigQuery(
+                args.api, args.version, cache_dir=args.discovery_cache
+            ).method_schema(args.function),
             indent=2,
             default=str,
         )
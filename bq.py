@@ -28,6 +28,7 @@ import json
 import textwrap
 
 from bqflow.util.bigquery_api import BigQuery, get_schema
+from bqflow.util.bigquery_api import schema_cache_load, schema_cache_save
 from bqflow.util.configuration import Configuration
 from bqflow.util.csv import csv_to_rows
 from bqflow.util.google_api import API_BigQuery
@@ -181,6 +182,11 @@ def main():
   parser.add_argument(
       '-from_schema', help='use SCHEMA file when uploading csv', default=False
   )
+  parser.add_argument(
+      '-schema_cache',
+      help='reuse or store detected csv SCHEMA by header in this json file',
+      default=False,
+  )
 
   parser.add_argument(
       '-to_task',
@@ -254,14 +260,25 @@ def main():
         with open(args.from_schema, 'r', encoding='utf-8') as schema_file:
           schema = json.load(schema_file)
 
+      elif args.schema_cache:
+        schema_cache_load(args.schema_cache)
+        rows, schema = get_schema(rows, cache=True)
+        schema_cache_save(args.schema_cache)
+
       else:
         rows, schema = get_schema(rows)
         print('DETECTED SCHEMA', json.dumps(schema))
         print('Please run again with the above schema provided.')
         exit()
 
+      # first csv row is always the header, skipped by the load job
       BigQuery(config, auth).rows_to_table(
-          config.project, args.dataset, args.table, rows, schema
+          config.project,
+          args.dataset,
+          args.table,
+          rows,
+          schema=schema,
+          header=True,
       )
 
   elif args.from_json:
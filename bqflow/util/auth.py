@@ -22,6 +22,7 @@ import time
 import threading
 
 from googleapiclient import discovery
+from googleapiclient.discovery_cache.base import Cache
 from googleapiclient.http import HttpRequest
 
 from bqflow.util.auth_wrapper import CredentialsFlowWrapper
@@ -32,10 +33,25 @@ DISCOVERY_CACHE = {} # strore (DISCOVERY_CACHE_CREDENTIALS, DISCOVERY_CACHE_TIME
 DISCOVERY_CACHE_CREDENTIALS, DISCOVERY_CACHE_TIME = 0, 1
 DISCOVERY_CACHE_SECONDS = 590 # refresh the cache for long running process, 60 minutes from testing.
 APIS_WITHOUT_DISCOVERY_DOCS = ('oauth',)
+DOCUMENT_CACHE = {} # store discovery url -> document JSON, shared by every build
 
 # set timeout to 10 minutes
 socket.setdefaulttimeout(600)
 
+class DocumentCache(Cache):
+  """Keeps discovery documents in memory, rebuilding a service skips the download.
+
+  Services are built per thread and rebuilt every DISCOVERY_CACHE_SECONDS,
+  the document itself does not change while the process runs.
+  """
+
+  def get(self, url):
+    return DOCUMENT_CACHE.get(url)
+
+  def set(self, url, content):
+    DOCUMENT_CACHE[url] = content
+
+
 def get_credentials(config, auth):
 
   if auth == 'user':
@@ -86,19 +102,26 @@ def get_service(config,
 ):
   global DISCOVERY_CACHE
 
-  class HttpRequestCustom(HttpRequest):
-
-    def __init__(self, *args, **kwargs):
-      if headers:
-        kwargs['headers'].update(headers)
-      super(HttpRequestCustom, self).__init__(*args, **kwargs)
-
   if not key:
     key = config.key
 
-  cache_key = api + version + auth + str(key) + str(threading.current_thread().ident) + config.fingerprint()
+  # called for every API request, so only build the service on a miss
+  cache_key = (api, version, auth, key, threading.get_ident(), config.fingerprint())
+  cached = DISCOVERY_CACHE.get(cache_key)
+
+  if cached is None or time.time() - cached[DISCOVERY_CACHE_TIME] > DISCOVERY_CACHE_SECONDS:
+
+    class HttpRequestCustom(HttpRequest):
+
+      def __init__(self, *args, **kwargs):
+        if headers:
+          kwargs['headers'].update(headers)
+          # the client only asks for gzip responses when the agent says (gzip)
+          user_agent = kwargs['headers'].get('user-agent', '')
+          if '(gzip)' not in user_agent:
+            kwargs['headers']['user-agent'] = (user_agent + ' (gzip)').strip()
+        super(HttpRequestCustom, self).__init__(*args, **kwargs)
 
-  if cache_key not in DISCOVERY_CACHE or time.time() - DISCOVERY_CACHE[cache_key][DISCOVERY_CACHE_TIME] > DISCOVERY_CACHE_SECONDS:
     credentials = get_credentials(config, auth)
 
     if uri_file:
@@ -137,7 +160,8 @@ def get_service(config,
           developerKey=key,
           requestBuilder=HttpRequestCustom,
           discoveryServiceUrl=uri_template,
-          static_discovery=False
+          static_discovery=False,
+          cache=DocumentCache()
         ), time.time()
 
       # PATCH: static_discovery not present in google-api-python-client < 2, default version in colab
@@ -154,7 +178,8 @@ def get_service(config,
           credentials=credentials,
           developerKey=key,
           requestBuilder=HttpRequestCustom,
-          discoveryServiceUrl=uri_template
+          discoveryServiceUrl=uri_template,
+          cache=DocumentCache()
         ), time.time()
 
   return DISCOVERY_CACHE[cache_key][DISCOVERY_CACHE_CREDENTIALS]
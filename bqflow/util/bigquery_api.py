@@ -18,6 +18,11 @@
 
 import re
 import sys
+import functools
+import asyncio
+import copy
+import hashlib
+import itertools
 import codecs
 import base64
 import csv
@@ -26,34 +31,91 @@ import json
 import datetime
 import time
 
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
 from googleapiclient.errors import HttpError
 from googleapiclient.http import MediaIoBaseUpload
 from google.cloud.bigquery._helpers import _row_tuple_from_json
+from google.cloud.bigquery.schema import _to_schema_fields
 
+from bqflow.util.auth import get_credentials
 from bqflow.util.misc import flag_last, memory_scale
 from bqflow.util.google_api import API_BigQuery, API_Retry
 from bqflow.util.csv import row_header_sanitize
+from bqflow.util.json_fast import orjson
 
 BIGQUERY_CHUNKSIZE = memory_scale(maximum=4294967296, multiple=256 * 1024)
+BIGQUERY_SINGLE_UPLOAD = 5 * 1024 * 1024  # below this skip resumable session
+
+# upload reads copy this much of the buffer at a time, keep well below buffer
+BIGQUERY_UPLOAD_CHUNKSIZE = min(BIGQUERY_CHUNKSIZE, 256 * 1024 * 1024)
 
 RE_TABLE_NAME = re.compile(r'[^\w]+')
 RE_INDENT = re.compile(r' {5,}')
+RE_PARAMETER = re.compile(r'\[PARAMETER\]')
 
 BIGQUERY_DATE_FORMAT = "%Y-%m-%d"
 BIGQUERY_TIME_FORMAT = "%H:%M:%S"
 
+JOB_WAIT_MINIMUM = 0.2  # seconds before first poll
+JOB_WAIT_MULTIPLIER = 1.5  # back off growth per poll
+JOB_WAIT_MAXIMUM = 5.0  # seconds cap between polls
 
-class JSON_To_BigQuery(json.JSONEncoder):
-  """Translate complex Python objects into BigQuery formats where json does not have defaults.
+TABLE_LIST_WORKERS = 16  # datasets listed concurrently by table_list
+ROWS_BATCH = 1024  # rows handed to csv writerows at once by rows_to_table
 
-  Usage: json.dumps(..., cls=JSON_To_BigQuery)
+SCHEMA_CACHE = {}  # store header hash -> inferred schema, see get_schema
+
+
+def _bq_default(obj):
+  """Translate complex Python objects into BigQuery formats.
+
+  Shared by JSON_To_BigQuery and orjson default hook.
 
   Currently translates:
     bytes -> base64
     detetime - > str
     dete - > str
     time - > str
+    map -> list
+
+  Args:
+    obj -  any json dumps parameter without a default handler
+
+  Returns:
+    Always a JSON serializable version of the object passed in.
+
+  Raises:
+    TypeError if the object has no translation.
+  """
+
+  # f-strings match BIGQUERY_DATE_FORMAT and BIGQUERY_TIME_FORMAT but skip
+  # strftime format parsing, which is slow for per row conversion
+  if isinstance(obj, bytes):
+    return base64.standard_b64encode(obj).decode("ascii")
+  elif isinstance(obj, datetime.datetime):
+    return (
+      f'{obj.year:04d}-{obj.month:02d}-{obj.day:02d} '
+      f'{obj.hour:02d}:{obj.minute:02d}:{obj.second:02d}'
+    )
+  elif isinstance(obj, datetime.date):
+    return f'{obj.year:04d}-{obj.month:02d}-{obj.day:02d}'
+  elif isinstance(obj, datetime.time):
+    return f'{obj.hour:02d}:{obj.minute:02d}:{obj.second:02d}'
+  elif isinstance(obj, map):
+    return list(obj)
+  else:
+    raise TypeError(
+      'Object of type %s is not JSON serializable' % type(obj).__name__
+    )
+
+
+class JSON_To_BigQuery(json.JSONEncoder):
+  """Translate complex Python objects into BigQuery formats where json does not have defaults.
+
+  Usage: json.dumps(..., cls=JSON_To_BigQuery)
+
+  See _bq_default for translations, prefer orjson with that hook if available.
 
   Args:
     obj -  any json dumps parameter without a default handler
@@ -64,18 +126,7 @@ class JSON_To_BigQuery(json.JSONEncoder):
   """
 
   def default(self, obj):
-    if isinstance(obj, bytes):
-      return base64.standard_b64encode(obj).decode("ascii")
-    elif isinstance(obj, datetime.datetime):
-      return obj.strftime("%s %s" % ( self.BIGQUERY_DATE_FORMAT, self.BIGQUERY_TIME_FORMAT))
-    elif isinstance(obj, datetime.date):
-      return obj.strftime(self.BIGQUERY_DATE_FORMAT)
-    elif isinstance(obj, datetime.time):
-      return obj.strftime(self.BIGQUERY_TIME_FORMAT)
-    elif isinstance(obj, map):
-      return list(obj)
-    else:
-      return super(JSON_To_BigQuery, self).default(obj)
+    return _bq_default(obj)
 
 
 def make_schema(header):
@@ -86,14 +137,60 @@ def make_schema(header):
   } for name in row_header_sanitize(header)]
 
 
-def get_schema(rows, header=True, infer_type=True):
+def schema_cache_key(header, infer_type=True):
+  """Hash header row, its width, and infer_type into a SCHEMA_CACHE key."""
+
+  key = '%d|%d|%s' % (
+    infer_type,
+    len(header),
+    '|'.join(str(h) for h in header)
+  )
+  return hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def schema_cache_load(path):
+  """Merge a JSON file written by schema_cache_save into SCHEMA_CACHE."""
+
+  try:
+    with open(path, 'r', encoding='utf-8') as cache_file:
+      SCHEMA_CACHE.update(json.load(cache_file))
+  except FileNotFoundError:
+    pass
+
+
+def schema_cache_save(path):
+  """Write SCHEMA_CACHE to a JSON file so recurring loads can reuse it."""
+
+  with open(path, 'w', encoding='utf-8') as cache_file:
+    json.dump(SCHEMA_CACHE, cache_file)
+
+
+def get_schema(rows, header=True, infer_type=True, cache=False):
   """CAUTION: Memory suck.
 
   This function sabotages iteration by iterating thorough the new object and
   returning a new iterator RECOMMEND: Define the schema yourself, it will
   also ensure data integrity downstream.
+
+  Rows are buffered first, then types are inferred one column at a time using
+  set comprehensions, which avoids per cell schema lookups in Python.
+
+  If cache is True and a schema was already inferred for the same header row
+  and infer_type it is reused from SCHEMA_CACHE.  Only type inference is
+  skipped, rows are buffered in memory and padded either way.  CAUTION: the
+  cache is keyed by header, clear it if column contents change type.
   """
 
+  cached = None
+  if cache and header:
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+      return [], []
+    key = schema_cache_key(first, infer_type)
+    cached = SCHEMA_CACHE.get(key)
+    rows = itertools.chain([first], rows)
+
   schema = []
   row_buffer = []
 
@@ -104,20 +201,17 @@ def get_schema(rows, header=True, infer_type=True):
     float: 'FLOAT'
   } if infer_type else {}  # empty lookup defaults to STRING below
 
-  # first non null value determines type
-  non_null_column = set()
-
-  first = True
   ct_columns = 0
 
   for row in rows:
 
-    # buffer the iterator to be returned with schema
-    row += [None] * (ct_columns - len(row))
+    # buffer the iterator to be returned with schema, pad only short rows
+    if len(row) < ct_columns:
+      row.extend([None] * (ct_columns - len(row)))
     row_buffer.append(row)
 
     # define schema field names and set defaults ( if no header enumerate fields )
-    if first:
+    if len(row_buffer) == 1:
       ct_columns = len(row)
       for index, value in enumerate(row_header_sanitize(row)):
         schema.append({
@@ -125,59 +219,110 @@ def get_schema(rows, header=True, infer_type=True):
           'type': 'STRING'
         })
 
-    # then determine type of each column
-    if not first and header:
-      for index, value in enumerate(row):
-        # if null, set only mode
-        if value is None or value == '':
-          schema[index]['mode'] = 'NULLABLE'
-        else:
-          column_type = type_to_bq.get(type(value), 'STRING')
-          # if type is set, check to make sure its consistent
-          if index in non_null_column:
-            # change type only if its inconsistent
-            if column_type != schema[index]['type']:
-              # mixed integers and floats default to floats
-              if column_type in (
-                  'INTEGER', 'FLOAT') and schema[index]['type'] in ('INTEGER',
-                                                                    'FLOAT'):
-                schema[index]['type'] = 'FLOAT'
-              # any strings are always strings
-              else:
-                schema[index]['type'] = 'STRING'
-          # if first non null value, then just set type
-          else:
-            schema[index]['type'] = column_type
-            non_null_column.add(index)
-
-    # no longer first row
-    first = False
+  if cached is not None:
+    return row_buffer, copy.deepcopy(cached)
+
+  # then determine type of each column, skipping the header row
+  if header and len(row_buffer) > 1:
+    for field, column in zip(schema, zip(*row_buffer[1:])):
+
+      # if null, set only mode
+      if None in column or '' in column:
+        field['mode'] = 'NULLABLE'
+
+      # collect python types first, only distinct types are mapped to BigQuery
+      column_types = {
+        type(value) for value in column if value is not None and value != ''
+      }
+      column_types = {type_to_bq.get(t, 'STRING') for t in column_types}
+
+      # consistent non null values determine type
+      if len(column_types) == 1:
+        field['type'] = column_types.pop()
+
+      # mixed integers and floats default to floats
+      elif column_types and column_types <= {'INTEGER', 'FLOAT'}:
+        field['type'] = 'FLOAT'
+
+      # any strings are always strings
+
+  if cache and header:
+    SCHEMA_CACHE[key] = copy.deepcopy(schema)
 
   return row_buffer, schema
 
 
-def row_to_json(row, schema, as_object=False):
+def rows_to_records(rows, schema=None, header=False):
+  """Pair list rows with field names so they can be loaded as JSON.
+
+  Dictionaries and pre-encoded strings pass through unchanged.  Field names
+  come from the schema, or from the first row if header is True and no schema
+  is given.  A list header row is never yielded.  List rows without any field
+  names raise ValueError instead of loading as empty records.
+
+  Args:
+    * rows: Iterator of lists, dictionaries, or JSON strings.
+    * schema: Optional BigQuery schema, used for field names.
+    * header: True if the first row contains field names.
+
+  Returns:
+    * Iterator of dictionaries or strings accepted by json_to_table.
+  """
+
+  rows = iter(rows)
+  names = [field['name'] for field in schema or []]
+
+  if header:
+    first = next(rows, None)
+    if isinstance(first, (list, tuple)):
+      names = names or row_header_sanitize(first)
+    elif first is not None:
+      yield first
+
+  for row in rows:
+    if isinstance(row, (dict, str)):
+      yield row
+    elif names:
+      yield dict(zip(names, row))
+    else:
+      raise ValueError(
+        'JSON rows need field names, provide a schema or set header=True.'
+      )
+
+
+def row_converter(schema, as_object=False):
+  """Build a row_to_json function with the schema parsed once.
+
+  Parsing the JSON schema into SchemaField objects dominates per row cost, so
+  bulk readers call this once and apply the returned function to every row.
+
+  Args:
+    * schema: BigQuery JSON schema fields.
+    * as_object: If True rows become dictionaries, otherwise lists.
+
+  Returns:
+    * Function that converts one API row {'f':[{'v':...}]} to Python values.
+  """
 
   if as_object:
-    row_raw = {'f': [{'v': row}]}
-    schema_raw = [{
+    fields = _to_schema_fields([{
         'name': 'wrapper',
         'type': 'RECORD',
         'mode': 'REQUIRED',
         'fields': schema
-    }]
-    return _row_tuple_from_json(row_raw, schema_raw)[0]
+    }])
+    return lambda row: _row_tuple_from_json({'f': [{'v': row}]}, fields)[0]
 
   else:
-    row_raw = row
-    schema_raw = schema
-    return list(_row_tuple_from_json(row_raw, schema_raw))
+    fields = _to_schema_fields(schema)
+    return lambda row: list(_row_tuple_from_json(row, fields))
 
 
-def bigquery_date(value):
-  return value.strftime('%Y%m%d')
+def row_to_json(row, schema, as_object=False):
+  return row_converter(schema, as_object)(row)
 
 
+@functools.lru_cache(maxsize=1024)
 def table_name_sanitize(name):
   return RE_TABLE_NAME.sub('_', name)
 
@@ -191,27 +336,39 @@ def query_parameters(query, parameters):
   print query_parameters(query, parameters)
   """
 
-  # no effect other than visual formatting
-  query = RE_INDENT.sub(r'\n\g<0>', query)
+  # no effect other than visual formatting, substring check skips the regex
+  if '     ' in query:
+    query = RE_INDENT.sub(r'\n\g<0>', query)
 
   if not parameters:
     return query
   elif isinstance(parameters, dict):
     return query.format(**parameters)
   else:
-    while '[PARAMETER]' in query:
-      try:
-        parameter = parameters.pop(0)
-      except IndexError:
-        raise IndexError('BigQuery: Missing PARAMETER values for this query.')
-      if isinstance(parameter, list) or isinstance(parameter, tuple):
+    parts = RE_PARAMETER.split(query)
+    if len(parameters) < len(parts) - 1:
+      raise IndexError('BigQuery: Missing PARAMETER values for this query.')
+
+    # interleave query parts and parameters in a single join
+    query = [parts[0]]
+    for part, parameter in zip(parts[1:], parameters):
+      if isinstance(parameter, (list, tuple)):
         parameter = ', '.join([str(p) for p in parameter])
-      query = query.replace('[PARAMETER]', parameter, 1)
+      query.append(str(parameter))
+      query.append(part)
+    query = ''.join(query)
+
     print('QUERY:', query)
     return query
 
 
 class BigQuery():
+  """Helper for BigQuery REST calls used by tasks and scripts.
+
+  Each call builds a light API_BigQuery wrapper, the discovery built service
+  and its http connection underneath are memoized per thread by get_service,
+  so wrappers are cheap and must not be shared because they hold call state.
+  """
 
   def __init__(self, config, auth):
     self.config = config
@@ -219,7 +376,37 @@ class BigQuery():
     self.job = None
 
 
+  def _job_done(self, result):
+    """Check a jobs().get response, raise on error, True if complete."""
+
+    if 'errors' in result['status']:
+      raise Exception(
+          'BigQuery Job Error: %s' %
+          ' '.join([e['message'] for e in result['status']['errors']]))
+    elif 'errorResult' in result['status']:
+      raise Exception('BigQuery Job Error: %s' %
+                      result['status']['errorResult']['message'])
+    elif result['status']['state'] == 'DONE':
+      if self.config.verbose:
+        print('JOB COMPLETE:', result['id'])
+      return True
+    return False
+
+
+  def _job_request(self, job):
+    return API_BigQuery(self.config, self.auth).jobs().get(
+        projectId=job['jobReference']['projectId'],
+        jobId=job['jobReference']['jobId'])
+
+
   def job_wait(self, job=None):
+    """Block until job completes, polling with an exponential back off.
+
+    Polling starts at JOB_WAIT_MINIMUM seconds and grows by JOB_WAIT_MULTIPLIER
+    up to JOB_WAIT_MAXIMUM, so short jobs return quickly and long jobs do not
+    hammer the API.
+    """
+
     if job is not None:
       self.job = job
 
@@ -227,26 +414,46 @@ class BigQuery():
       if self.config.verbose:
         print('BIGQUERY JOB WAIT:', self.job['jobReference']['jobId'])
 
-      request = API_BigQuery(self.config, self.auth).jobs().get(
-          projectId=self.job['jobReference']['projectId'],
-          jobId=self.job['jobReference']['jobId'])
+      request = self._job_request(self.job)
+      delay = JOB_WAIT_MINIMUM
 
       while True:
-        time.sleep(5)
+        time.sleep(delay)
+        delay = min(delay * JOB_WAIT_MULTIPLIER, JOB_WAIT_MAXIMUM)
         if self.config.verbose:
           print('.', end='')
         sys.stdout.flush()
-        result = API_Retry(request)
-        if 'errors' in result['status']:
-          raise Exception(
-              'BigQuery Job Error: %s' %
-              ' '.join([e['message'] for e in result['status']['errors']]))
-        elif 'errorResult' in result['status']:
-          raise Exception('BigQuery Job Error: %s' %
-                          result['status']['errorResult']['message'])
-        elif result['status']['state'] == 'DONE':
-          if self.config.verbose:
-            print('JOB COMPLETE:', result['id'])
+        if self._job_done(API_Retry(request)):
+          break
+
+
+  async def job_wait_async(self, job=None):
+    """Same as job_wait but yields to the event loop between polls.
+
+    Allows many jobs to be waited on concurrently, for example:
+
+      await asyncio.gather(*[bigquery.job_wait_async(j) for j in jobs])
+
+    Unlike job_wait, self.job is not modified so one instance can await many.
+    """
+
+    job = job or self.job
+
+    if job:
+      if self.config.verbose:
+        print('BIGQUERY JOB WAIT:', job['jobReference']['jobId'])
+
+      # build the request on the worker thread, services are not thread safe
+      def poll():
+        return API_Retry(self._job_request(job))
+
+      delay = JOB_WAIT_MINIMUM
+      loop = asyncio.get_running_loop()
+
+      while True:
+        await asyncio.sleep(delay)
+        delay = min(delay * JOB_WAIT_MULTIPLIER, JOB_WAIT_MAXIMUM)
+        if self._job_done(await loop.run_in_executor(None, poll)):
           break
 
 
@@ -308,43 +515,56 @@ class BigQuery():
         datasetId=dataset_id
       ).execute()['access']
 
-      # if emails
-      for email in emails:
-        access.append({
-          'userByEmail': email,
-          'role': role,
-        })
-
-      # if groups
-      for group in groups:
-        access.append({
-          'groupByEmail': group,
-          'role': role,
-        })
-
-      for view in views:
-        access.append({
-          'view': {
-            'projectId': project_id,
-            'datasetId': view['dataset'],
-            'tableId': view['view']
-          }
-        })
-
-      API_BigQuery(self.config, self.auth).datasets().patch(
-        projectId=project_id,
-        datasetId=dataset_id,
-        body={'access': access}
-      ).execute()
+      entries = [{
+        'userByEmail': email,
+        'role': role,
+      } for email in emails]
+
+      entries.extend({
+        'groupByEmail': group,
+        'role': role,
+      } for group in groups)
+
+      entries.extend({
+        'view': {
+          'projectId': project_id,
+          'datasetId': view['dataset'],
+          'tableId': view['view']
+        }
+      } for view in views)
+
+      # only add grants not already present, skip patch if nothing changes
+      existing = set(json.dumps(a, sort_keys=True) for a in access)
+      changed = False
+      for entry in entries:
+        key = json.dumps(entry, sort_keys=True)
+        if key not in existing:
+          existing.add(key)
+          access.append(entry)
+          changed = True
+
+      if changed:
+        API_BigQuery(self.config, self.auth).datasets().patch(
+          projectId=project_id,
+          datasetId=dataset_id,
+          body={'access': access}
+        ).execute()
 
 
   def query_run(self, project_id, query, legacy=False):
     self.job = API_BigQuery(self.config, self.auth).jobs().query(
       projectId=project_id,
-      body={'query': query, 'useLegacySql': legacy}
+      body={
+        'query': query,
+        'useLegacySql': legacy,
+        'requestId': str(uuid.uuid4()),
+        'timeoutMs': 10000
+      }
     ).execute()
 
-    self.job_wait()
+    # short queries complete inline, no need to poll
+    if not self.job.get('jobComplete'):
+      self.job_wait()
 
 
   def query_to_table(
@@ -483,14 +703,20 @@ class BigQuery():
     header=False,
     wait=True
   ):
+    """Load list rows into a table as CSV, or as JSON records if requested.
+
+    Rows are written ROWS_BATCH at a time and the buffer is uploaded once it
+    passes BIGQUERY_CHUNKSIZE, so the cap is soft and a chunk can exceed it by
+    up to one batch of rows.
+    """
 
-    # check if JSON format, use custom handler
+    # check if JSON format, use custom handler, list rows become records
     if source_format == 'JSON':
       return self.json_to_table(
         project_id = project_id,
         dataset_id = dataset_id,
         table_id = table_id,
-        json_data = rows,
+        json_data = rows_to_records(rows, schema, header),
         schema = schema,
         disposition = disposition,
         wait = wait
@@ -509,10 +735,14 @@ class BigQuery():
     )
     has_rows = False
 
-    for is_last, row in flag_last(rows):
+    # batches let writerows loop in C instead of a python call per row
+    rows = iter(rows)
+    batches = iter(lambda: list(itertools.islice(rows, ROWS_BATCH)), [])
+
+    for is_last, batch in flag_last(batches):
 
-      # write row to csv buffer
-      writer.writerow(row)
+      # write rows to csv buffer
+      writer.writerows(batch)
 
       # write the buffer in chunks
       if is_last or buffer_data.tell() + 1 > BIGQUERY_CHUNKSIZE:
@@ -573,12 +803,22 @@ class BigQuery():
     for is_last, record in flag_last(json_data):
 
       # check if json is already string encoded, and write to buffer
-      buffer_data.write(
-        (record if isinstance(record, str) else json.dumps(record, cls=JSON_To_BigQuery)
-      ).encode('utf-8'))
+      if isinstance(record, str):
+        buffer_data.write(record.encode('utf-8'))
+      elif orjson:
+        buffer_data.write(orjson.dumps(
+          record,
+          default=_bq_default,
+          option=orjson.OPT_PASSTHROUGH_DATETIME
+        ))
+      else:
+        buffer_data.write(json.dumps(record, cls=JSON_To_BigQuery).encode('utf-8'))
+
+      # every record is terminated, for newline delimited json
+      buffer_data.write(b'\n')
 
       # write the buffer in chunks
-      if is_last or buffer_data.tell() + 1 > BIGQUERY_CHUNKSIZE:
+      if is_last or buffer_data.tell() > BIGQUERY_CHUNKSIZE:
         if self.config.verbose:
           print('BigQuery Buffer Size', buffer_data.tell())
         buffer_data.seek(0)  # reset for read
@@ -592,10 +832,6 @@ class BigQuery():
         disposition = 'WRITE_APPEND'  # append all remaining records
         has_rows = True
 
-      # if not end append newline, for newline delimited json
-      else:
-        buffer_data.write('\n'.encode('utf-8'))
-
     # if no rows, clear table to simulate empty write
     if not has_rows:
       return self.io_to_table(
@@ -626,14 +862,18 @@ class BigQuery():
 
     # if data exists, write data to table
     data_bytes.seek(0, 2)
-    if data_bytes.tell() > 0:
+    size = data_bytes.tell()
+    if size > 0:
       data_bytes.seek(0)
 
+      # small payloads go in one multipart request, no session round trip
+      resumable = size >= BIGQUERY_SINGLE_UPLOAD
+
       media = MediaIoBaseUpload(
         data_bytes,
         mimetype='application/octet-stream',
-        resumable=True,
-        chunksize=BIGQUERY_CHUNKSIZE
+        resumable=resumable,
+        chunksize=BIGQUERY_UPLOAD_CHUNKSIZE
      )
 
       body = {
@@ -671,11 +911,12 @@ class BigQuery():
       ).execute(run=False)
       execution = job.execute()
 
-      response = None
-      while response is None:
-        status, response = job.next_chunk()
-        if self.config.verbose and status:
-          print('Uploaded %d%%.' % int(status.progress() * 100))
+      if resumable:
+        response = None
+        while response is None:
+          status, response = job.next_chunk()
+          if self.config.verbose and status:
+            print('Uploaded %d%%.' % int(status.progress() * 100))
       if self.config.verbose:
         print('Uploaded 100%')
 
@@ -850,13 +1091,33 @@ class BigQuery():
     else:
       datasets = [dataset_id]
 
-    for dataset_id in datasets:
-      for table in API_BigQuery(self.config, self.auth, iterate=True).tables().list(
+    # each worker thread gets its own service object from get_service
+    with ThreadPoolExecutor(
+      max_workers=min(TABLE_LIST_WORKERS, len(datasets) or 1)
+    ) as executor:
+      for tables in executor.map(
+        lambda d: self._list_tables_in_dataset(project_id, d),
+        datasets
+      ):
+        yield from tables
+
+
+  def _list_tables_in_dataset(self, project_id, dataset_id):
+    return [
+      (
+        table['tableReference']['datasetId'],
+        table['tableReference']['tableId'],
+        table['type']
+      ) for table in API_BigQuery(
+        self.config,
+        self.auth,
+        iterate=True
+      ).tables().list(
         projectId=project_id,
         datasetId=dataset_id,
         fields='tables.tableReference, tables.type, nextPageToken'
-      ).execute():
-        yield table['tableReference']['datasetId'], table['tableReference']['tableId'], table['type']
+      ).execute()
+    ]
 
 
   def table_exists(self, project_id, dataset_id, table_id):
@@ -920,23 +1181,39 @@ class BigQuery():
     fields=None,
     row_start=0,
     row_max=None,
-    as_object=False
+    as_object=False,
+    use_storage_api=False
   ):
+    """Read rows from a table or view.
+
+    Tables are read with tabledata().list() by default.  Setting use_storage_api
+    streams Arrow batches through the BigQuery Storage Read API instead, which
+    is much faster for large tables but requires optional packages
+    google-cloud-bigquery-storage and pyarrow.  Views and row_start always use
+    the REST path.
+    """
 
     if self.config.verbose:
       print('BIGQUERY ROWS:', project_id, dataset_id, table_id)
 
-    table = API_BigQuery(self.config, self.auth).tables().get(
-      projectId=project_id,
-      datasetId=dataset_id,
-      tableId=table_id
-    ).execute()
+    table = self.table_get(project_id, dataset_id, table_id)
 
     table_schema = table['schema'].get('fields', [])
     table_type = table['type']
     table_legacy = table.get('view', {}).get('useLegacySql', False)
 
-    if table_type == 'TABLE':
+    if table_type == 'TABLE' and use_storage_api and not row_start:
+      yield from self._storage_to_rows(
+        project_id,
+        dataset_id,
+        table_id,
+        fields,
+        row_max,
+        as_object
+      )
+
+    elif table_type == 'TABLE':
+      convert = row_converter(table_schema, as_object)
       for row in API_BigQuery(
         self.config,
         self.auth,
@@ -949,11 +1226,7 @@ class BigQuery():
         startIndex=row_start,
         maxResults=row_max,
       ).execute():
-        yield row_to_json(
-          row,
-          table_schema,
-          as_object
-        )
+        yield convert(row)
 
     else:
       yield from self.query_to_rows(
@@ -965,26 +1238,77 @@ class BigQuery():
       )
 
 
+  def _storage_to_rows(
+    self,
+    project_id,
+    dataset_id,
+    table_id,
+    fields=None,
+    row_max=None,
+    as_object=False
+  ):
+    """Stream table rows as Arrow batches using the BigQuery Storage Read API."""
+
+    try:
+      from google.cloud import bigquery_storage
+    except ModuleNotFoundError as e:
+      raise ModuleNotFoundError(
+        'PLEASE RUN: python3 -m pip install google-cloud-bigquery-storage pyarrow'
+      ) from e
+
+    client = bigquery_storage.BigQueryReadClient(
+      credentials=get_credentials(self.config, self.auth)
+    )
+
+    read_session = bigquery_storage.types.ReadSession(
+      table='projects/%s/datasets/%s/tables/%s' % (
+        project_id,
+        dataset_id,
+        table_id
+      ),
+      data_format=bigquery_storage.types.DataFormat.ARROW
+    )
+
+    if fields:
+      read_session.read_options.selected_fields = [
+        f.strip() for f in fields.split(',')
+      ]
+
+    # single stream preserves table order like tabledata().list()
+    session = client.create_read_session(
+      parent='projects/%s' % self.config.project,
+      read_session=read_session,
+      max_stream_count=1
+    )
+
+    if not session.streams:
+      return
+
+    row_count = 0
+    for page in client.read_rows(session.streams[0].name).rows(session).pages:
+      for record in page.to_arrow().to_pylist():
+        if row_max is not None and row_count >= row_max:
+          return
+        yield record if as_object else list(record.values())
+        row_count += 1
+
+
   def table_to_schema(self, project_id, dataset_id, table_id):
     if self.config.verbose:
       print('TABLE SCHEMA:', project_id, dataset_id, table_id)
 
-    return API_BigQuery(self.config, self.auth).tables().get(
-      projectId=project_id,
-      datasetId=dataset_id,
-      tableId=table_id
-    ).execute()['schema'].get('fields', [])
+    return self.table_get(
+      project_id,
+      dataset_id,
+      table_id
+    )['schema'].get('fields', [])
 
 
   def table_to_type(self, project_id, dataset_id, table_id):
     if self.config.verbose:
       print('TABLE TYPE:', project_id, dataset_id, table_id)
 
-    return API_BigQuery(self.config, self.auth).tables().get(
-      projectId=project_id,
-      datasetId=dataset_id,
-      tableId=table_id
-    ).execute()['type']
+    return self.table_get(project_id, dataset_id, table_id)['type']
 
 
   def query_to_rows(
@@ -1016,12 +1340,13 @@ class BigQuery():
     if dataset_id:
       body['defaultDataset'] = {'projectId': project_id, 'datasetId': dataset_id}
 
-    # wait for query to complete
-
+    # wait for query to complete, short queries return rows inline
     response = API_BigQuery(self.config, self.auth).jobs().query(
         projectId=project_id, body=body).execute()
+    delay = JOB_WAIT_MINIMUM
     while not response['jobComplete']:
-      time.sleep(5)
+      time.sleep(delay)
+      delay = min(delay * JOB_WAIT_MULTIPLIER, JOB_WAIT_MAXIMUM)
       response = API_BigQuery(self.config, self.auth).jobs().getQueryResults(
         projectId=project_id,
         jobId=response['jobReference']['jobId']
@@ -1029,18 +1354,19 @@ class BigQuery():
 
     # fetch query results
     schema = response.get('schema', {}).get('fields', None)
+    convert = row_converter(schema or [], as_object)
 
     row_count = 0
     while 'rows' in response:
       for row in response['rows']:
-        yield row_to_json(row, schema, as_object)
+        yield convert(row)
         row_count += 1
 
-      if 'PageToken' in response:
+      if 'pageToken' in response:
         response = API_BigQuery(self.config, self.auth).jobs().getQueryResults(
           projectId=project_id,
           jobId=response['jobReference']['jobId'],
-          pageToken=response['PageToken']
+          pageToken=response['pageToken']
         ).execute(iterate=False)
       elif row_count < int(response['totalRows']):
         response = API_BigQuery(self.config, self.auth).jobs().getQueryResults(
@@ -1079,60 +1405,69 @@ class BigQuery():
     return response['schema'].get('fields', [])
 
 
-  def _get_max_date_from_table(
+  def _get_date_range_from_table(
     self,
     project_id,
     dataset_id,
     table_id,
     billing_project_id=None
   ):
-    if not billing_project_id:
-      billing_project_id = project_id
+    """Return (MIN, MAX) of Report_Day in one query, values as API strings."""
 
-    query = ('SELECT MAX(Report_Day) FROM `' + project_id + '.' + dataset_id +
-             '.' + table_id + '` ')
+    query = (
+      'SELECT MIN(Report_Day), MAX(Report_Day) FROM `' + project_id + '.' +
+      dataset_id + '.' + table_id + '` '
+    )
 
-    body = {
+    response = API_BigQuery(self.config, self.auth).jobs().query(
+      projectId=billing_project_id or project_id,
+      body = {
         'kind': 'bigquery#queryRequest',
         'query': query,
-        'defaultDataset': {
-            'datasetId': dataset_id,
-        },
+        'timeoutMs': 10000,
         'useLegacySql': False,
-    }
+      }
+    ).execute()
 
-    job = API_BigQuery(self.config, self.auth).jobs().query(
-        projectId=billing_project_id, body=body).execute()
-    return job['rows'][0]['f'][0]['v']
+    # single row result usually returns inline, otherwise wait then fetch
+    if not response.get('jobComplete'):
+      self.job_wait(response)
+      response = API_BigQuery(self.config, self.auth).jobs().getQueryResults(
+        projectId=response['jobReference']['projectId'],
+        jobId=response['jobReference']['jobId']
+      ).execute()
 
+    row = response['rows'][0]['f']
+    return row[0]['v'], row[1]['v']
 
-  def _get_min_date_from_table(
+
+  def _get_max_date_from_table(
     self,
     project_id,
     dataset_id,
-    table_id
+    table_id,
+    billing_project_id=None
   ):
+    return self._get_date_range_from_table(
+      project_id,
+      dataset_id,
+      table_id,
+      billing_project_id
+    )[1]
 
-    query = (
-      'SELECT MIN(Report_Day) FROM `' + project_id + '.' + dataset_id +
-      '.' + table_id + '` '
-    )
-
-    self.job = API_BigQuery(self.config, self.auth).jobs().query(
-      projectId=self.config.project,
-      body = {
-        'kind': 'bigquery#queryRequest',
-        'query': query,
-        'defaultDataset': {
-            'datasetId': dataset_id,
-        },
-        'useLegacySql': False,
-      }
-    ).execute()
-
-    self.job_wait()
 
-    return self.job['rows'][0]['f'][0]['v']
+  def _get_min_date_from_table(
+    self,
+    project_id,
+    dataset_id,
+    table_id
+  ):
+    return self._get_date_range_from_table(
+      project_id,
+      dataset_id,
+      table_id,
+      self.config.project
+    )[0]
 
 
   #start and end date must be in format YYYY-MM-DD
@@ -1151,17 +1486,4 @@ class BigQuery():
       'AND Report_Day <= "' + end_date + '"'
     )
 
-    self.job = API_BigQuery(self.config, self.auth).jobs().query(
-      projectId=self.config.project,
-      body = {
-        'kind': 'bigquery#queryRequest',
-        'query': query,
-        'defaultDataset': {
-          'datasetId': dataset_id,
-        },
-        'useLegacySql': False,
-      }
-    ).execute()
-
-    self.job_wait()
-    return job['rows'][0]['f'][0]['v']
+    self.query_run(self.config.project, query)
@@ -56,6 +56,7 @@ import os
 import json
 import hashlib
 import datetime
+import functools
 
 # handle python 3.8-3.9 transition
 try:
@@ -63,8 +64,44 @@ try:
 except:
   from pytz import timezone as ZoneInfo
 
+from bqflow.util.json_fast import orjson
+
+
+@functools.lru_cache(maxsize=16)
+def _get_timezone(name):
+  return ZoneInfo(name)
+
+
+def _fingerprint_dumps(value):
+  """Serialize to stable bytes, orjson writes bytes without an encode step."""
+
+  if orjson:
+    return orjson.dumps(value, default=repr, option=orjson.OPT_SORT_KEYS)
+  return json.dumps(value, default=repr, sort_keys=True).encode()
+
+
 class Configuration():
 
+  # fixed attribute set, no per instance __dict__, weakref for client caches
+  __slots__ = (
+    'project',
+    'service',
+    'client',
+    'user',
+    'verbose',
+    'browserless',
+    'key',
+    '_auth_options',
+    'days',
+    'hours',
+    '_fingerprint',
+    'timezone',
+    'now',
+    'date',
+    'hour',
+    '__weakref__'
+  )
+
   def __init__(
     self,
     project=None,
@@ -101,34 +138,48 @@ class Configuration():
     self.browserless = browserless
     self.key = key
 
+    # credentials are fixed for the life of the configuration, resolve once
+    if user and service:
+      self._auth_options = 'BOTH'
+    elif user:
+      self._auth_options = 'USER'
+    elif service:
+      self._auth_options = 'SERVICE'
+    else:
+      self._auth_options = 'NONE'
+
     self.days = []
     self.hours = []
 
-    self.timezone = ZoneInfo(timezone)
+    self._fingerprint = None  # (project, digest) memoized by fingerprint
+
+    self.timezone = _get_timezone(timezone)
     self.now = datetime.datetime.now(self.timezone)
     self.date = self.now.date()
     self.hour = self.now.hour
 
     if self.verbose:
-      print('DATE:', self.now.date())
-      print('HOUR:', self.now.hour)
+      print('DATE:', self.date)
+      print('HOUR:', self.hour)
 
 
   def auth_options(self):
-    if self.user and self.service:
-      return 'BOTH'
-    elif self.user:
-      return 'USER'
-    elif self.service:
-      return 'SERVICE'
-    else:
-      return 'NONE'
+    return self._auth_options
 
 
   def fingerprint(self):
     """Provide value that can be used as a cache key.
+
+    Called for every API request, so the digest is memoized and only
+    recomputed if project is reassigned.
     """
 
-    h = hashlib.sha256()
-    h.update(json.dumps(self.project).encode())
-    return h.hexdigest()
+    if self._fingerprint is None or self._fingerprint[0] is not self.project:
+      h = hashlib.blake2b(digest_size=16)
+      # hash bytes directly, project is almost always a plain string
+      if isinstance(self.project, str):
+        h.update(self.project.encode())
+      else:
+        h.update(_fingerprint_dumps(self.project))
+      self._fingerprint = (self.project, h.hexdigest())
+    return self._fingerprint[1]
@@ -19,6 +19,7 @@
 import re
 import csv
 import ctypes
+import functools
 from io import StringIO
 
 #from xlsx import Workbook
@@ -108,7 +109,8 @@ def response_utf8_stream(response, chunksize):
 
 
 def bigquery_date(value):
-  return value.strftime('%Y%m%d')
+  # avoids strftime parsing the format on every call
+  return f'{value.year:04d}{value.month:02d}{value.day:02d}'
 
 
 #def excel_to_sheets(excel_file):
@@ -149,8 +151,14 @@ def csv_to_rows(csv_string):
       yield row
 
 
-def rows_to_csv(rows):
-  csv_string = StringIO()
+def rows_to_csv(rows, csv_file=None):
+  """Write rows as CSV into csv_file, or a new StringIO if not given.
+
+  Pass an open file to stream rows straight to disk without holding the
+  whole CSV in memory.  Returns the buffer, rewound if it was created here.
+  """
+
+  csv_string = StringIO() if csv_file is None else csv_file
   writer = csv.writer(
       csv_string,
       delimiter=',',
@@ -164,7 +172,8 @@ def rows_to_csv(rows):
       count += 1
     except Exception as e:
       print('Error:', row_number, str(e), row)
-  csv_string.seek(0)  # important otherwise contents is zero
+  if csv_file is None:
+    csv_string.seek(0)  # important otherwise contents is zero
   print('CSV Rows Written:', count)
   return csv_string
 
@@ -196,15 +205,21 @@ def rows_header_trim(rows):
     first = False
 
 
-def column_header_sanitize(cell):
+@functools.lru_cache(maxsize=4096)
+def _column_header_sanitize(cell):
   header_sanitized = RE_HUMAN.sub('_',
-                                  str(cell).title().replace(
+                                  cell.title().replace(
                                       '%', 'Percent')).strip('_')
-  if header_sanitized[0].isdigit():
+  if header_sanitized[:1].isdigit():
     header_sanitized = '_' + header_sanitized  # bigquery does not take leading digits
   return header_sanitized
 
 
+def column_header_sanitize(cell):
+  # headers repeat across chunks and reports, so the cleanup is cached
+  return _column_header_sanitize(str(cell))
+
+
 def row_header_sanitize(row):
   return [column_header_sanitize(cell) for cell in row]
 
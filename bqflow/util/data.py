@@ -30,14 +30,33 @@ Key benfits include:
 """
 
 from __future__ import annotations
+import itertools
+import threading
 from typing import Any
+import weakref
 
 # TODO(kenjora): Replace function imports with classes.
-from bqflow.util.bigquery_api import BigQuery, query_parameters
+# API helpers are imported where used, recipes only load the ones they touch.
 from bqflow.util.configuration import Configuration
 from bqflow.util.csv import rows_to_csv, rows_to_type
-from bqflow.util.sheets_api import Sheets
-from bqflow.util.storage_api import bucket_create, object_put
+
+# store config -> {(class, auth, thread): client}, released with the config
+_CLIENTS = weakref.WeakKeyDictionary()
+
+
+def _client(cls: type, config: Configuration, auth: str) -> Any:
+  """Reuse Sheets helpers per config, auth, and thread.
+
+  Avoids rebuilding helpers on every get_rows and put_rows call.  Keyed by
+  thread because helpers are not thread safe.  BigQuery helpers are cheap and
+  built per call, so no table state outlives a single read or write.
+  """
+
+  clients = _CLIENTS.setdefault(config, {})
+  key = (cls, auth, threading.get_ident())
+  if key not in clients:
+    clients[key] = cls(config, auth)
+  return clients[key]
 
 
 def get_rows(
@@ -108,87 +127,136 @@ def get_rows(
 
   # if handler points to list, concatenate all the values from various sources
   if isinstance(source, list):
-    for s in source:
-      for r in get_rows(config, auth, s):
-        yield r
+    yield from itertools.chain.from_iterable(
+        get_rows(config, auth, s, as_object, unnest) for s in source
+    )
 
-  # if handler is an endpoint, fetch data
+  # if handler is an endpoint, fetch data from each source it names
   else:
-    if 'values' in source:
-      if isinstance(source['values'], list):
-        for value in source['values']:
-          yield value
-      else:
-        yield source['values']
-
-    # should be sheets, deprecate sheet over next few releases
-    if 'sheet' in source:
-      rows = Sheets(config, source['sheet'].get('auth', auth)).sheet_read(
-          source['sheet']['sheet'],
-          source['sheet']['tab'],
-          source['sheet']['range'],
-      )
+    # resolve per source flags locally, caller arguments stay untouched
+    source_unnest = (
+        unnest
+        or source.get('single_cell', False)
+        or source.get('unnest', False)
+    )
 
-      for row in rows:
-        yield row[0] if (
-            unnest
-            or source.get('single_cell', False)
-            or source.get('unnest', False)
-        ) else row
-
-    if 'sheets' in source:
-      rows = Sheets(config, source['sheets'].get('auth', auth)).sheet_read(
-          source['sheets']['sheet'],
-          source['sheets']['tab'],
-          source['sheets']['range'],
-      )
+    # one pass over the source, each handler receives its own block
+    for key, value in source.items():
+      handler = _SOURCE_HANDLERS.get(key)
+      if handler:
+        yield from handler(config, auth, value, as_object, source_unnest)
 
-      if rows:
-        for row in rows:
-          yield row[0] if (
-              unnest
-              or source.get('single_cell', False)
-              or source.get('unnest', False)
-          ) else row
-      else:
-        print('No rows in source.')
-
-    if 'bigquery' in source:
-
-      rows = []
-      as_object = as_object or source['bigquery'].get('as_object', False)
-      unnest = (
-          unnest
-          or source.get('single_cell', False)
-          or source.get('unnest', False)
-      )
 
-      if 'table' in source['bigquery']:
-        rows = BigQuery(
-            config, source['bigquery'].get('auth', auth)
-        ).table_to_rows(
-            source['bigquery'].get('project', config.project),
-            source['bigquery']['dataset'],
-            source['bigquery']['table'],
-            as_object=as_object or source['bigquery'].get('as_object', False),
-        )
-
-      else:
-        rows = BigQuery(
-            config, source['bigquery'].get('auth', auth)
-        ).query_to_rows(
-            source['bigquery'].get('project', config.project),
-            source['bigquery']['dataset'],
-            query_parameters(
-                source['bigquery']['query'],
-                source['bigquery'].get('parameters', {}),
-            ),
-            legacy=source['bigquery'].get('legacy', False),
-            as_object=as_object or source['bigquery'].get('as_object', False),
-        )
-
-      for row in rows:
-        yield row[0] if not as_object and unnest else row
+def _get_rows_values(
+    config: Configuration,
+    auth: str,
+    values: Any,
+    as_object: bool,
+    unnest: bool,
+) -> list:
+  """Yields literal values from a { "values": ... } source."""
+
+  yield from values if isinstance(values, list) else (values,)
+
+
+def _get_rows_sheet(
+    config: Configuration,
+    auth: str,
+    sheet: dict[str, Any],
+    as_object: bool,
+    unnest: bool,
+) -> list:
+  """Yields rows from a { "sheet": ... } source, deprecated for sheets."""
+
+  from bqflow.util.sheets_api import Sheets
+
+  rows = _client(Sheets, config, sheet.get('auth', auth)).sheet_read(
+      sheet['sheet'],
+      sheet['tab'],
+      sheet['range'],
+  )
+
+  if unnest:
+    for row in rows:
+      yield row[0]
+  else:
+    yield from rows
+
+
+def _get_rows_sheets(
+    config: Configuration,
+    auth: str,
+    sheet: dict[str, Any],
+    as_object: bool,
+    unnest: bool,
+) -> list:
+  """Yields rows from a { "sheets": ... } source."""
+
+  from bqflow.util.sheets_api import Sheets
+
+  rows = _client(Sheets, config, sheet.get('auth', auth)).sheet_read(
+      sheet['sheet'],
+      sheet['tab'],
+      sheet['range'],
+  )
+
+  if rows and unnest:
+    for row in rows:
+      yield row[0]
+  elif rows:
+    yield from rows
+  else:
+    print('No rows in source.')
+
+
+def _get_rows_bigquery(
+    config: Configuration,
+    auth: str,
+    bigquery: dict[str, Any],
+    as_object: bool,
+    unnest: bool,
+) -> list:
+  """Yields rows from a { "bigquery": ... } table or query source."""
+
+  from bqflow.util.bigquery_api import BigQuery, query_parameters
+
+  source_as_object = as_object or bigquery.get('as_object', False)
+  flatten = unnest and not source_as_object
+
+  if 'table' in bigquery:
+    rows = BigQuery(config, bigquery.get('auth', auth)).table_to_rows(
+        bigquery.get('project', config.project),
+        bigquery['dataset'],
+        bigquery['table'],
+        as_object=source_as_object,
+    )
+
+  else:
+    rows = BigQuery(config, bigquery.get('auth', auth)).query_to_rows(
+        bigquery.get('project', config.project),
+        bigquery['dataset'],
+        query_parameters(
+            bigquery['query'],
+            bigquery.get('parameters', {}),
+        ),
+        legacy=bigquery.get('legacy', False),
+        as_object=source_as_object,
+    )
+
+  if flatten:
+    for row in rows:
+      yield row[0]
+  else:
+    yield from rows
+
+
+# extensible, add a handler to define a new source, keyed by source block
+_SOURCE_HANDLERS = {
+    'values': _get_rows_values,
+    'sheet': _get_rows_sheet,
+    'sheets': _get_rows_sheets,
+    'bigquery': _get_rows_bigquery,
+}
 
 
 def put_rows(
@@ -217,6 +285,7 @@ def put_rows(
           "table": [string]
           "schema": [json - standard bigquery schema json],
           "header": [boolean - true if header exists in rows]
+          "format": [string - CSV or JSON, JSON uses schema names for list rows]
           "disposition": [string - same as BigQuery documentation]
           "merge": [string list - columns to maintain uniqueness on]
         },
@@ -255,13 +324,33 @@ def put_rows(
       print('PUT ROWS: Rows is None, ignoring write.')
     return None
 
+  # appends of nothing are a no-op, peek a row to skip the API round trip
+  if 'bigquery' in destination:
+    skip_empty = destination['bigquery'].get('disposition') == 'WRITE_APPEND'
+  else:
+    skip_empty = 'sheets' in destination and not destination['sheets'].get(
+        'delete', False
+    )
+
+  if skip_empty:
+    rows = iter(rows)
+    try:
+      rows = itertools.chain([next(rows)], rows)
+    except StopIteration:
+      if config.verbose:
+        print('PUT ROWS: Rows is empty, ignoring write.')
+      return None
+
   if 'bigquery' in destination:
+    from bqflow.util.bigquery_api import BigQuery
 
     table = destination['bigquery']['table']
     if 'merge' in destination['bigquery']:
       table += '_MERGE'
 
-    BigQuery(config, destination['bigquery'].get('auth', auth)).rows_to_table(
+    bigquery = BigQuery(config, destination['bigquery'].get('auth', auth))
+
+    bigquery.rows_to_table(
         project_id=destination['bigquery'].get('project_id', config.project),
         dataset_id=destination['bigquery']['dataset'],
         table_id=table,
@@ -275,7 +364,7 @@ def put_rows(
     )
 
     if 'merge' in destination['bigquery']:
-      BigQuery(config, destination['bigquery'].get('auth', auth)).table_merge(
+      bigquery.table_merge(
           project_id=destination['bigquery'].get('project_id', config.project),
           dataset_id=destination['bigquery']['dataset'],
           source_table_id=table,
@@ -284,14 +373,18 @@ def put_rows(
       )
 
   elif 'sheets' in destination:
+    from bqflow.util.sheets_api import Sheets
+
+    sheets = _client(Sheets, config, destination['sheets'].get('auth', auth))
+
     if destination['sheets'].get('delete', False):
-      Sheets(config, destination['sheets'].get('auth', auth)).tab_clear(
+      sheets.tab_clear(
           destination['sheets']['sheet'],
           destination['sheets']['tab'],
           destination['sheets']['range'],
       )
 
-    Sheets(config, destination['sheets'].get('auth', auth)).tab_write(
+    sheets.tab_write(
         destination['sheets']['sheet'],
         destination['sheets']['tab'],
         destination['sheets']['range'],
@@ -301,13 +394,15 @@ def put_rows(
 
   elif 'file' in destination:
     with open(destination['file'], 'w', encoding='UTF-8') as file:
-      file.write(rows_to_csv(rows).read())
+      rows_to_csv(rows, file)
 
   elif (
       'storage' in destination
       and destination['storage'].get('bucket')
       and destination['storage'].get('path')
   ):
+    from bqflow.util.storage_api import bucket_create, object_put
+
     bucket_create(
         config,
         destination['storage'].get('auth', auth),
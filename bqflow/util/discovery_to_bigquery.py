@@ -35,17 +35,138 @@ For example:
   ))
 """
 
-import json
+import copy
+import hashlib
+import operator
+import os
+import pickle
 import re
+import tempfile
+import time
 from collections.abc import Mapping, Sequence
-from copy import deepcopy
-from urllib import request
+from typing import Any
+from urllib import error, request
+
+from bqflow.util.json_fast import loads as json_loads
 
 
 DATETIME_RE = re.compile(r'\d{4}[-/]\d{2}[-/]\d{2}[ T]\d{2}:\d{2}:\d{2}\.?\d+Z')
 DESCRIPTION_LENGTH = 1024
 RECURSION_DEPTH = 2
 
+# (type, format) -> BigQuery type, (type, None) is the default for a type
+BIGQUERY_TYPES = {
+  ('any', None): 'STRING',
+  ('array', None): 'REPEATED',
+  ('boolean', None): 'BOOLEAN',
+  ('integer', None): 'INT64',
+  ('number', 'double'): 'FLOAT64',
+  ('number', None): 'FLOAT',
+  ('object', None): 'STRUCT',
+  ('string', 'byte'): 'BYTES',
+  ('string', 'date'): 'DATE',
+  ('string', 'date-time'): 'TIMESTAMP',
+  ('string', 'int64'): 'STRING', # 'INT64' because APIs require string ids
+  ('string', 'uint64'): 'STRING', # 'INT64' because APIs require string ids
+  ('string', None): 'STRING',
+}
+
+# opt in, set to a directory such as ~/.cache/bqflow/discovery/ to keep copies
+DISCOVERY_CACHE_DIR = os.environ.get('BQFLOW_DISCOVERY_CACHE') or None
+DISCOVERY_RETRIES = 3
+DISCOVERY_TIMEOUT = 30 # seconds
+DISCOVERY_WAIT = 1 # seconds, doubled on every retry
+DISCOVERY_RETRY_CODES = (429, 500, 502, 503, 504)
+DOCUMENT_CACHE = {} # store url -> parsed discovery document, never mutated
+VERSION_CACHE = {} # store (api_name, key) -> preferred version
+
+
+def discovery_fetch(
+  api_url: str,
+  cache_dir: str = DISCOVERY_CACHE_DIR
+) -> Mapping:
+  """Fetch and parse a discovery URL once per process, revalidate on disk.
+
+  The disk copy is a pickle of (etag, document), which loads faster than
+  parsing the JSON again.  It is reused when the server answers 304, any
+  unreadable copy is treated as a miss and replaced atomically.
+  Rate limits, server errors, and dropped connections retry with back off.
+
+  Args:
+    api_url: the full discovery URL to fetch.
+    cache_dir: directory for the disk copy, None to skip it, defaults to the
+      BQFLOW_DISCOVERY_CACHE environment variable.
+
+  Returns:
+    The parsed JSON document, shared so callers must not modify it.
+  """
+
+  if api_url in DOCUMENT_CACHE:
+    return DOCUMENT_CACHE[api_url]
+
+  etag, document = None, None
+  if cache_dir:
+    cache_dir = os.path.expanduser(cache_dir)
+    cache_file = os.path.join(
+      cache_dir,
+      hashlib.sha1(api_url.encode()).hexdigest() + '.pickle'
+    )
+    try:
+      with open(cache_file, 'rb') as cache:
+        etag, document = pickle.load(cache)
+    except Exception: # truncated, foreign, or stale pickle is a cache miss
+      etag, document = None, None
+
+  print('DISCOVERY FETCH:', api_url)
+  api_request = request.Request(api_url)
+  if etag:
+    api_request.add_header('If-None-Match', etag)
+
+  wait = DISCOVERY_WAIT
+  for retries in range(DISCOVERY_RETRIES, -1, -1):
+    try:
+      with request.urlopen(api_request, timeout=DISCOVERY_TIMEOUT) as response:
+        etag = response.headers.get('ETag')
+        document = json_loads(response.read())
+      if cache_dir and etag:
+        _discovery_save(cache_file, etag, document)
+      break
+    except error.HTTPError as e:
+      if e.code == 304 and document is not None:
+        break
+      elif e.code not in DISCOVERY_RETRY_CODES or not retries:
+        raise
+    except (error.URLError, ConnectionError, TimeoutError):
+      if not retries:
+        raise
+    print('DISCOVERY RETRY / WAIT:', retries, wait)
+    time.sleep(wait)
+    wait *= 2
+
+  DOCUMENT_CACHE[api_url] = document
+  return document
+
+
+def _discovery_save(
+  cache_file: str,
+  etag: str,
+  document: Mapping
+) -> None:
+  """Write a discovery pickle so concurrent readers never see a partial file."""
+
+  cache_dir = os.path.dirname(cache_file)
+  os.makedirs(cache_dir, exist_ok=True)
+  with tempfile.NamedTemporaryFile(
+    'wb', dir=cache_dir, suffix='.tmp', delete=False
+  ) as cache:
+    try:
+      pickle.dump((etag, document), cache, pickle.HIGHEST_PROTOCOL)
+    except BaseException:
+      cache.close()
+      os.remove(cache.name)
+      raise
+  os.replace(cache.name, cache_file)
+
 
 def preferred_version(
   api_name: str,
@@ -64,13 +185,92 @@ def preferred_version(
     HttpError: If the wrong API values are specified.
   """
 
-  api_url = 'https://discovery.googleapis.com/discovery/v1/apis?name=%s&key=%s&preferred=true' % (
-    api_name,
-    key or ''
-  )
-  print('DISCOVERY FETCH:', api_url)
-  api_info = json.load(request.urlopen(api_url))
-  return api_info['items'][0]['version']
+  if (api_name, key) not in VERSION_CACHE:
+    api_url = 'https://discovery.googleapis.com/discovery/v1/apis?name=%s&key=%s&preferred=true' % (
+      api_name,
+      key or ''
+    )
+    api_info = discovery_fetch(api_url, cache_dir=None)
+    VERSION_CACHE[(api_name, key)] = api_info['items'][0]['version']
+  return VERSION_CACHE[(api_name, key)]
+
+
+def _ref_dependencies(entry: Mapping) -> set:
+  """Returns every $ref used anywhere inside a schema definition."""
+
+  refs = set()
+  stack = [entry]
+  while stack:
+    node = stack.pop()
+    if '$ref' in node:
+      refs.add(node['$ref'])
+    stack.extend(v for v in node.values() if isinstance(v, dict))
+  return refs
+
+
+def acyclic_refs(schemas: Mapping) -> set:
+  """Returns schemas that can never reach themselves through $ref.
+
+  Runs an iterative Tarjan strongly connected components pass over the
+  $ref graph.  Components come out successors first, so a schema is acyclic
+  when its component is a single node without a self reference and all of
+  its dependencies are acyclic.  Expanding such a schema does not depend on
+  the recursion counters, it is the same everywhere it appears.
+
+  Args:
+    schemas: the 'schemas' section of a discovery document.
+
+  Returns:
+    Set of schema names whose full $ref closure has no cycle.
+  """
+
+  deps = {
+    name: _ref_dependencies(schema.get('properties', {})) & schemas.keys()
+    for name, schema in schemas.items()
+  }
+
+  index, lowlink, on_stack, stack, acyclic = {}, {}, set(), [], set()
+
+  for root in deps:
+    if root in index:
+      continue
+
+    work = [(root, iter(deps[root]))]
+    index[root] = lowlink[root] = len(index)
+    stack.append(root)
+    on_stack.add(root)
+
+    while work:
+      node, children = work[-1]
+      for child in children:
+        if child not in index:
+          index[child] = lowlink[child] = len(index)
+          stack.append(child)
+          on_stack.add(child)
+          work.append((child, iter(deps[child])))
+          break
+        elif child in on_stack:
+          lowlink[node] = min(lowlink[node], index[child])
+      else:
+        work.pop()
+        if work:
+          lowlink[work[-1][0]] = min(lowlink[work[-1][0]], lowlink[node])
+        if lowlink[node] == index[node]:
+          component = []
+          while True:
+            member = stack.pop()
+            on_stack.discard(member)
+            component.append(member)
+            if member == node:
+              break
+          if (
+            len(component) == 1
+            and node not in deps[node]
+            and deps[node] <= acyclic
+          ):
+            acyclic.add(node)
+
+  return acyclic
 
 
 class Discovery_To_BigQuery():
@@ -86,7 +286,8 @@ class Discovery_To_BigQuery():
     api_version: str,
     key: str = None,
     labels: str = None,
-    recursion_depth: int = RECURSION_DEPTH
+    recursion_depth: int = RECURSION_DEPTH,
+    cache_dir: str = DISCOVERY_CACHE_DIR
   ) -> None:
     """Initialize the API endpoint.
 
@@ -96,6 +297,8 @@ class Discovery_To_BigQuery():
       key: optional key: https://cloud.google.com/docs/authentication/api-keys
       labels: optional and rearely used to version the discovery document
       recursion_depth: if a schema is recursive, how deep to nest.
+      cache_dir: where to keep discovery documents on disk, None to disable,
+        defaults to the BQFLOW_DISCOVERY_CACHE environment variable.
 
     Returns:
       None
@@ -113,8 +316,11 @@ class Discovery_To_BigQuery():
       self.key,
       self.labels
     )
-    print('DISCOVERY FETCH:', api_url)
-    self.api_document = json.load(request.urlopen(api_url))
+    self.api_document = discovery_fetch(api_url, cache_dir)
+    self._schemas = self.api_document['schemas'] # bound once for ref lookups
+    self._schema_cache = {} # store ref or (ref, parents state) -> fields
+    self._json_cache = {} # store ref or (ref, parents state) -> expanded json
+    self._acyclic_refs = None # computed on first expansion
 
   def to_type(
     self,
@@ -132,38 +338,10 @@ class Discovery_To_BigQuery():
     """
 
     t = entry.get('type')
-    f = entry.get('format')
-
-    if t == 'any':
-      return 'STRING'
-    elif t == 'array':
-      return 'REPEATED'
-    elif t == 'boolean':
-      return 'BOOLEAN'
-    elif t == 'integer':
-      return 'INT64'
-    elif t == 'number':
-      if f == 'double':
-        return 'FLOAT64'
-      else:
-        return 'FLOAT'
-    elif t == 'object':
-      return 'STRUCT'
-    elif t == 'string':
-      if f == 'byte':
-        return 'BYTES'
-      elif f == 'date':
-        return 'DATE'
-      elif f == 'date-time':
-        return 'TIMESTAMP'
-      elif f == 'int64':
-        return 'STRING' #'INT64' because APIs require string ids
-      elif f == 'uint64':
-        return 'STRING' #'INT64' because APIs require string ids
-      else:
-        return 'STRING'
-    else:
-      return 'STRING'
+    return (
+      BIGQUERY_TYPES.get((t, entry.get('format')))
+      or BIGQUERY_TYPES.get((t, None), 'STRING')
+    )
 
   def to_schema(
     self,
@@ -175,7 +353,7 @@ class Discovery_To_BigQuery():
     Recursively crawls the discovery document reference tree to build schema.
     Leverages recursion depth passed in constructor to stop if necessary.
 
-    Sort the keys to get consitent field order, important for BigQuery DML.
+    Fields are sorted by name for consitent order, important for BigQuery DML.
 
     Args:
       entry: a discovery document schema definition.
@@ -186,48 +364,42 @@ class Discovery_To_BigQuery():
     """
 
     bigquery_schema = []
+    recursion_depth = self.recursion_depth
 
     if parents is None:
       parents = {}
 
-    for key, value in sorted(entry.items()):
+    for key, value in entry.items():
 
       # when the entry is { "type": "object", "someObject": {..} }, ignores "type"
-      if not isinstance(value, Mapping):
+      if not isinstance(value, dict):
         continue
 
       # struct with ref
       if '$ref' in value:
         parents.setdefault(value['$ref'], 0)
-        if parents[value['$ref']] < self.recursion_depth:
+        if parents[value['$ref']] < recursion_depth:
           parents[value['$ref']] += 1
           bigquery_schema.append({
             'name': key,
             'type': 'RECORD',
             'mode': 'NULLABLE',
-            'fields': self.to_schema(
-              self.api_document['schemas'][value['$ref']]['properties'],
-              parents
-            )
+            'fields': self._ref_schema(value['$ref'], parents)
           })
-        parents[value['$ref']] -= 1
+          parents[value['$ref']] -= 1
 
       elif 'items' in value:
 
         # array with ref
         if '$ref' in value['items']:
           parents.setdefault(value['items']['$ref'], 0)
-          if parents[value['items']['$ref']] < self.recursion_depth:
+          if parents[value['items']['$ref']] < recursion_depth:
             parents[value['items']['$ref']] += 1
             bigquery_schema.append({
               'name': key,
               'type': 'RECORD',
               'mode': 'REPEATED',
-              'fields': self.to_schema(
-                self.api_document['schemas'][value['items']['$ref']]
-                ['properties'],
-                parents
-              )
+              'fields': self._ref_schema(value['items']['$ref'], parents)
             })
             parents[value['items']['$ref']] -= 1
 
@@ -245,28 +417,107 @@ class Discovery_To_BigQuery():
 
         # array with scalar
         else:
+          t = value['items'].get('type')
           bigquery_schema.append({
             'description': (
-              ','.join(value['items'].get('enum', []))
-            )[:DESCRIPTION_LENGTH],
+              ','.join(value['items']['enum'])[:DESCRIPTION_LENGTH]
+              if 'enum' in value['items'] else ''
+            ),
             'name': key,
-            'type': self.to_type(value['items']),
+            'type': (
+              BIGQUERY_TYPES.get((t, value['items'].get('format')))
+              or BIGQUERY_TYPES.get((t, None), 'STRING')
+            ),
             'mode': 'REPEATED',
           })
 
-      # scalar
+      # scalar, to_type inlined as this is the most visited branch
       else:
+        t = value.get('type')
         bigquery_schema.append({
           'description': (
-            ','.join(value.get('enum', []))
-          )[:DESCRIPTION_LENGTH],
+            ','.join(value['enum'])[:DESCRIPTION_LENGTH]
+            if 'enum' in value else ''
+          ),
           'name': key,
-          'type': self.to_type(value),
+          'type': (
+            BIGQUERY_TYPES.get((t, value.get('format')))
+            or BIGQUERY_TYPES.get((t, None), 'STRING')
+          ),
           'mode': 'NULLABLE'
         })
 
+    # one sort of the finished level, memoized levels are never sorted again
+    bigquery_schema.sort(key=operator.itemgetter('name'))
     return bigquery_schema
 
+  def _ref_schema(
+    self,
+    ref: str,
+    parents: Mapping
+  ) -> Sequence:
+    """Memoized to_schema of a referenced schema, shared between branches.
+
+    The expansion only depends on the reference and the recursion counters,
+    so large APIs stop re-walking the same sub tree.  Returned lists are
+    shared, treat them as read only.
+
+    Args:
+      ref: the name of the schema in the discovery document.
+      parents: recursion counters, already incremented for ref.
+
+    Returns:
+      A BigQuery schema fields list.
+    """
+
+    key = self._ref_key(ref, parents)
+    if key not in self._schema_cache:
+      self._schema_cache[key] = self.to_schema(
+        self._schemas[ref]['properties'],
+        parents
+      )
+    return self._schema_cache[key]
+
+  def _ref_key(
+    self,
+    ref: str,
+    parents: Mapping
+  ) -> Any:
+    """Cache key for a reference expansion.
+
+    Schemas outside any $ref cycle expand the same at every depth, so the
+    name alone is enough.  Recursive schemas also depend on the counters.
+
+    Args:
+      ref: the name of the schema in the discovery document.
+      parents: recursion counters, already incremented for ref.
+
+    Returns:
+      A hashable key.
+    """
+
+    if self._acyclic_refs is None:
+      self._acyclic_refs = acyclic_refs(self._schemas)
+
+    if ref in self._acyclic_refs:
+      return ref
+    return (ref, frozenset((k, v) for k, v in parents.items() if v))
+
+  def _ref_json(
+    self,
+    ref: str,
+    parents: Mapping
+  ) -> Mapping:
+    """Memoized to_json of a referenced schema, see _ref_schema."""
+
+    key = self._ref_key(ref, parents)
+    if key not in self._json_cache:
+      self._json_cache[key] = self.to_json(
+        from_api = self._schemas[ref]['properties'],
+        parents = parents
+      )
+    return self._json_cache[key]
+
   def to_json(
     self,
     from_api: Mapping = None,
@@ -278,11 +529,14 @@ class Discovery_To_BigQuery():
     Recursively crawls the discovery document reference tree to build document.
     Leverages recursion depth passed in constructor to stop if necessary.
 
-    Sort for consistency with to_schema.
+    Keys keep document order, to_struct sorts them when building output.
+    Only nodes on a path to a reference are copied, every other sub tree is
+    shared with the discovery document and the process wide DOCUMENT_CACHE,
+    so treat the result as read only.  Use resource_json for an editable copy.
 
     Args:
       from_api: the api schema to extrapolate
-      from_json: new object with references replaced, not passed by caller
+      from_json: sub tree being expanded, not passed by caller
       parents: used to track recursion depth for a specific schema branch
 
     Returns:
@@ -292,34 +546,38 @@ class Discovery_To_BigQuery():
     if parents is None:
       parents = {}
 
-    if from_api:
-      from_json = deepcopy(from_api)
+    recursion_depth = self.recursion_depth
+    node = from_api or from_json
+    node_json = None # shallow copy of node, made only once a child changes
 
-    for key, value in sorted(from_json.items()):
+    # dict keeps source order, visiting order does not change the result
+    for key, value in node.items():
 
       # when the entry is { "type": "object", "someObject": {..} }, ignores "type"
-      if not isinstance(value, Mapping):
+      if not isinstance(value, dict):
         continue
 
       if '$ref' in value:
         ref = value['$ref']
         parents.setdefault(ref, 0)
-        if parents[ref] < self.recursion_depth:
+        if parents[ref] < recursion_depth:
           parents[ref] += 1
-          del value['$ref']
-          value['type'] = 'dict'
-          value['object'] = self.to_json(
-            from_api = self.api_document['schemas'][ref]['properties'],
-            parents = parents
-          )
+          value_json = {k: v for k, v in value.items() if k != '$ref'}
+          value_json['type'] = 'dict'
+          value_json['object'] = self._ref_json(ref, parents)
           parents[ref] -= 1
         else:
-          from_json[key] = None
+          value_json = None
 
       else:
-        self.to_json(from_json = value, parents = parents)
+        value_json = self.to_json(from_json = value, parents = parents)
+
+      if value_json is not value:
+        if node_json is None:
+          node_json = dict(node)
+        node_json[key] = value_json
 
-    return from_json
+    return node if node_json is None else node_json
 
   def to_struct(
     self,
@@ -332,12 +590,13 @@ class Discovery_To_BigQuery():
     Recursively crawls the discovery document reference tree to build struct.
     Leverages recursion depth passed in constructor to stop if necessary.
 
-    Sort for consistency with to_schema.
+    Sort for consistency with to_schema.  Fragments go into one list that is
+    joined once, nested levels do not build intermediate strings.
 
     Args:
       from_api: the api schema to extrapolate
       from_json: new object with references replaced, not passed by caller
-      parents: used to track recursion depth for a specific schema branch
+      indent: spaces in front of each top level field
 
     Returns:
       A BigQuery STRUCT object that can be pasted into a query.
@@ -346,41 +605,49 @@ class Discovery_To_BigQuery():
     if from_api:
       from_json = self.to_json(from_api = from_api)
 
-    fields = []
+    struct = []
+    self._to_struct(from_json, indent, struct)
+    return ''.join(struct)
+
+  def _to_struct(
+    self,
+    from_json: Mapping,
+    indent: int,
+    struct: list
+  ) -> None:
+    """Appends STRUCT fragments to struct, joined once by to_struct.
+
+    Args:
+      from_json: object with references replaced, see to_json.
+      indent: spaces in front of each field at this level.
+      struct: list of string fragments being built.
+    """
+
     spaces = ' ' * indent
+    separator = ''
 
     for key, value in sorted(from_json.items()):
 
       # when the entry is { "type": "object", "someObject": {..} }, ignores "type"
-      if not isinstance(value, Mapping):
+      if not isinstance(value, dict):
         continue
 
+      struct.append(separator)
+      separator = ',\n'
+
       if value['type'] == 'dict':
-        fields.append('%sSTRUCT(\n%s\n%s) AS %s' % (
-          spaces,
-          self.to_struct(from_json = value['object'], indent = indent + 2),
-          spaces,
-          key
-        ))
+        struct.extend((spaces, 'STRUCT(\n'))
+        self._to_struct(value['object'], indent + 2, struct)
+        struct.extend(('\n', spaces, ') AS ', key))
       elif value['type'] == 'array':
         if 'enum' in value['items']:
-          fields.append('%s[%s\n%s] AS %s' % (
-            spaces,
-            'STRING',
-            spaces,
-            key
-          ))
+          struct.extend((spaces, '[STRING\n', spaces, '] AS ', key))
         else:
-          fields.append('%s[STRUCT(\n%s\n%s)] AS %s' % (
-            spaces,
-            self.to_struct(from_json = value['items'], indent = indent + 2),
-            spaces,
-            key
-          ))
+          struct.extend((spaces, '[STRUCT(\n'))
+          self._to_struct(value['items'], indent + 2, struct)
+          struct.extend(('\n', spaces, ')] AS ', key))
       else:
-        fields.append('%sCAST(NULL AS %s) AS %s' % (spaces, value['type'].upper(), key))
-
-    return ',\n'.join(fields)
+        struct.extend((spaces, 'CAST(NULL AS ', value['type'].upper(), ') AS ', key))
 
   def resource_json(
     self,
@@ -388,7 +655,8 @@ class Discovery_To_BigQuery():
   ) -> Mapping:
     """Return Discovery API Document json for a resource.
 
-    Expands all the references.
+    Expands all the references.  The result is a deep copy, callers may
+    modify it without touching the cached discovery document.
 
     Args:
       resource: the name of the Google API resource
@@ -397,8 +665,8 @@ class Discovery_To_BigQuery():
       A dictionary representation of the resource.
     """
 
-    resource = self.api_document['schemas'][resource]['properties']
-    return self.to_json(from_api = resource)
+    resource = self._schemas[resource]['properties']
+    return copy.deepcopy(self.to_json(from_api = resource))
 
   def resource_schema(
     self,
@@ -413,9 +681,29 @@ class Discovery_To_BigQuery():
       A dictionary representation of the resource.
     """
 
-    entry = self.api_document['schemas'][resource]['properties']
+    entry = self._schemas[resource]['properties']
     return self.to_schema(entry)
 
+  def resource_schemas(
+    self,
+    resources: Sequence[str]
+  ) -> Mapping:
+    """Return BigQuery schemas for many Discovery API resources.
+
+    Resources share the expansion cache, so schemas referenced by several
+    resources are only built once.  Runs in the calling thread, the document
+    is already loaded and the walk is pure Python, threads would only add
+    contention on the GIL.
+
+    Args:
+      resources: the names of the Google API resources
+
+    Returns:
+      A dictionary of resource name to BigQuery schema.
+    """
+
+    return {resource: self.resource_schema(resource) for resource in resources}
+
   def resource_struct(
     self,
     resource: str
@@ -429,7 +717,7 @@ class Discovery_To_BigQuery():
       A string STRUCT of the resource ready to be used in a query.
     """
 
-    resource = self.api_document['schemas'][resource]['properties']
+    resource = self._schemas[resource]['properties']
     return self.to_struct(from_api = resource)
 
   def method_schema(
@@ -457,7 +745,7 @@ class Discovery_To_BigQuery():
     resource = resource['methods'][method]['response']['$ref']
 
     # get schema
-    properties = self.api_document['schemas'][resource]['properties']
+    properties = self._schemas[resource]['properties']
     schema = self.to_schema(properties)
 
     # List responses wrap their items in a paginated response object
@@ -465,7 +753,7 @@ class Discovery_To_BigQuery():
     if iterate or ('List' in resource and resource.endswith('Response')):
       for entry in schema:
         if entry['type'] == 'RECORD':
-          return entry['fields']
+          return list(entry['fields'])
         elif entry['mode'] == 'REPEATED':
           entry['mode'] = 'NULLABLE'
           return [entry]
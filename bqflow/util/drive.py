@@ -27,21 +27,95 @@ Sources:
   - https://developers.google.com/drive/api/v3/reference/about#methods
 """
 
-from collections.abc import Mapping, Iterator
-from io import BytesIO
+from collections.abc import Mapping, Iterator, Sequence
+from io import BytesIO, IOBase
 from googleapiclient.http import MediaIoBaseUpload
 from googleapiclient.errors import HttpError
+import functools
+import itertools
 import mimetypes
 import re
+import time
+import weakref
 from typing import Any
 
 
-from bqflow.util.google_api import API_Drive
+from bqflow.util.auth import get_service
+from bqflow.util.google_api import API_Drive, API_Retry, retriable_http_error
 from bqflow.util.configuration import Configuration
 from bqflow.util import misc
 
 
-DRIVE_CHUNKSIZE = misc.memory_scale(maximum = 200 * 1024**3, multiple = 256 * 1024)
+# resumable chunks must be 256KiB multiples, bigger chunks trade memory for calls
+# but a failed chunk is sent again in full, so cap at 64MiB for flaky networks
+DRIVE_CHUNKSIZE = misc.memory_scale(maximum = 64 * 1024**2, multiple = 256 * 1024)
+DRIVE_BATCH_SIZE = 100 # Drive rejects batch requests with more calls
+DRIVE_QUERY = 'trashed = false' # base of every lookup, skips the trash
+DRIVE_LIST_FIELDS = 'nextPageToken, files(id, name, mimeType)' # partial response, all lookups need
+FILE_CACHE_TTL = 60 # seconds a file_find result is reused
+FILE_CACHE_SIZE = 1024 # per config, oldest lookups are dropped past this many
+FILE_CACHE = weakref.WeakKeyDictionary() # store config -> {(auth, name, parent): (time, file)}
+ABOUT_CACHE = weakref.WeakKeyDictionary() # store config -> {(auth, fields): about response}
+
+# one pass over any supported URL, the named group that matched holds the id
+RE_DRIVE_FILE_URL = re.compile(
+  r'https://drive\.google\.com/open\?id=(?P<open>.*)'
+  r'|https://drive\.google\.com(?=/).*?/(?:drive/folders|file/d)/(?P<drive>[a-zA-Z0-9-_]+)(?:/.*)?$'
+  r'|https://docs\.google\.com/\w+/d/(?P<docs>[a-zA-Z0-9-_]+)(?:/.*)?$'
+  r'|https://datastudio\.google\.com/c/\w+/(?P<datastudio>[a-zA-Z0-9-_]+)(?:/.*)?$'
+)
+RE_DRIVE_ID = re.compile(r'^([a-zA-Z0-9-_]+)$')
+DRIVE_URLS = (
+  'https://drive.google.com/',
+  'https://docs.google.com/',
+  'https://datastudio.google.com/'
+)
+
+
+def _file_cache_get(config: Configuration, key: tuple) -> Mapping[str, Any]:
+  """Return a cached file_find result if still within FILE_CACHE_TTL."""
+  cached = FILE_CACHE.get(config, {}).get(key)
+  if cached and time.monotonic() - cached[0] < FILE_CACHE_TTL:
+    return cached[1]
+  return None
+
+
+def _file_cache_put(
+  config: Configuration,
+  key: tuple,
+  drive_file: Mapping[str, Any]
+) -> None:
+  """Cache a file_find result, evicting the oldest entry when full."""
+  cache = FILE_CACHE.setdefault(config, {})
+  cache.pop(key, None)
+  if len(cache) >= FILE_CACHE_SIZE:
+    cache.pop(next(iter(cache)))
+  cache[key] = (time.monotonic(), drive_file)
+
+
+def _query_escape(value: str) -> str:
+  """Escape a value for a double quoted Drive query string."""
+  return value.replace('\\', '\\\\').replace('"', '\\"')
+
+
+@functools.lru_cache(maxsize=1024)
+def _guess_type(name: str) -> str:
+  return mimetypes.guess_type(name, strict = False)[0]
+
+
+def _as_stream(data: Any) -> IOBase:
+  """Pass seekable file objects through, wrap bytes or str in BytesIO.
+
+  Uploads then read from the caller's stream in DRIVE_CHUNKSIZE pieces
+  instead of holding a second full copy of the payload in memory.
+  """
+
+  if isinstance(data, IOBase) or hasattr(data, 'read'):
+    return data
+  elif isinstance(data, str):
+    return BytesIO(data.encode('utf-8'))
+  else:
+    return BytesIO(data or b' ') # if data is empty BAD REQUEST error occurs
 
 
 class Drive():
@@ -69,11 +143,19 @@ class Drive():
     self.auth = auth
 
   def about(self, fields: str = 'importFormats') -> Mapping[str, Any]:
-    """Helper for determining mime type of upload."""
-    return API_Drive(
-      config = self.config,
-      auth = self.auth
-    ).about().get(fields = fields).execute()
+    """Helper for determining mime type of upload, fetched once per fields.
+
+    Shared by every Drive helper on the same configuration and auth, callers
+    often build a new helper per file.
+    """
+    cache = ABOUT_CACHE.setdefault(self.config, {})
+    key = (self.auth, fields)
+    if key not in cache:
+      cache[key] = API_Drive(
+        config = self.config,
+        auth = self.auth
+      ).about().get(fields = fields).execute()
+    return cache[key]
 
   def file_id(self, url_or_name: str) -> str:
     """Returns the file id given a Name, URL, or file id.
@@ -87,42 +169,19 @@ class Drive():
       id of the sheet if found otherwise None
     """
 
-    if url_or_name.startswith('https://drive.google.com/open?id='):
-      return url_or_name.split('?id=', 1)[-1]
-
-    elif url_or_name.startswith('https://drive.google.com/'):
-      m = re.search(
-        '\/(?:drive\/folders|file\/d)\/([a-zA-Z0-9-_]+)(?:\/.*)?$',
-        url_or_name
-      )
-      if m:
-        return m.group(1)
-
-    elif url_or_name.startswith('https://docs.google.com/'):
-      m = re.search(
-        '^(?:https:\/\/docs.google.com\/\w+\/d\/)([a-zA-Z0-9-_]+)(?:\/.*)?$',
-        url_or_name
-      )
-      if m:
-        return m.group(1)
-
-    elif url_or_name.startswith('https://datastudio.google.com/'):
-      m = re.search(
-        '^(?:https:\/\/datastudio.google.com\/c\/\w+\/)([a-zA-Z0-9-_]+)(?:\/.*)?$',
-        url_or_name
-      )
-      if m:
-        return m.group(1)
+    m = RE_DRIVE_FILE_URL.match(url_or_name)
+    if m:
+      return m.group(m.lastgroup)
 
     # check if name given convert to ID 'Some Document'
-    else:
+    elif not url_or_name.startswith(DRIVE_URLS):
       document = self.file_find(url_or_name)
       if document:
         return document['id']
 
         # check if just ID given, '1uN9tnb-DZ9zZflZsoW4_34sf34tw3ff'
       else:
-        m = re.search('^([a-zA-Z0-9-_]+)$', url_or_name)
+        m = RE_DRIVE_ID.search(url_or_name)
         if m:
           return m.group(1)
 
@@ -153,39 +212,288 @@ class Drive():
         return False
     return False
 
+  def file_ids(self, urls_or_names: Sequence[str]) -> Mapping[str, str]:
+    """Returns file ids for many names, URLs, or ids, see file_id.
+
+    URLs are parsed locally and names are looked up with one files().list
+    call per DRIVE_BATCH_SIZE names instead of one call each.
+
+    Args:
+      urls_or_names: the urls, names, or IDs of the files.
+
+    Returns:
+      Dictionary of each input to its id, None if not found.
+    """
+
+    drive_ids = {}
+    names = []
+
+    for url_or_name in urls_or_names:
+      if url_or_name.startswith(DRIVE_URLS):
+        drive_ids[url_or_name] = self.file_id(url_or_name)
+      else:
+        drive_file = _file_cache_get(
+          self.config,
+          (self.auth, url_or_name, None)
+        )
+        if drive_file:
+          drive_ids[url_or_name] = drive_file['id']
+        else:
+          names.append(url_or_name)
+
+    names = iter(dict.fromkeys(names))
+    for chunk in iter(lambda: list(itertools.islice(names, DRIVE_BATCH_SIZE)), []):
+      query = '%s and (%s)' % (DRIVE_QUERY, ' or '.join(
+        'name = "%s"' % _query_escape(name) for name in chunk
+      ))
+
+      found = {}
+      for drive_file in API_Drive(
+        config = self.config,
+        auth = self.auth,
+        iterate = True
+      ).files().list(q = query, fields = DRIVE_LIST_FIELDS).execute():
+        found.setdefault(drive_file['name'], drive_file)
+
+      # names not found may be ids, '1uN9tnb-DZ9zZflZsoW4_34sf34tw3ff'
+      for name in chunk:
+        if name in found:
+          drive_ids[name] = found[name]['id']
+          _file_cache_put(self.config, (self.auth, name, None), found[name])
+        else:
+          m = RE_DRIVE_ID.search(name)
+          drive_ids[name] = m.group(1) if m else None
+
+    return drive_ids
+
+  def file_get_many(
+    self,
+    urls_or_names: Sequence[str]
+  ) -> Mapping[str, Mapping[str, Any]]:
+    """Helper for getting many files by url, name, or id in batch requests.
+
+    Each batch carries up to DRIVE_BATCH_SIZE files().get calls, the most
+    Drive accepts in one round trip.
+
+    Args:
+      urls_or_names: the urls, names, or IDs of the files.
+
+    Returns:
+      Dictionary of each input to its file, None if it does not exist.
+    """
+
+    drive_ids = self.file_ids(urls_or_names)
+    drive_files = self._batch_execute({
+      drive_id: API_Drive(
+        config = self.config,
+        auth = self.auth
+      ).files().get(fileId = drive_id).execute(run = False)
+      for drive_id in filter(None, drive_ids.values())
+    })
+
+    return {
+      url_or_name: drive_files.get(drive_id)
+      for url_or_name, drive_id in drive_ids.items()
+    }
+
+  def _batch_execute(self, jobs: Mapping[str, Any]) -> Mapping[str, Any]:
+    """Run API jobs in BatchHttpRequests of up to DRIVE_BATCH_SIZE calls.
+
+    Errors inside a batch are reported per call and never reach API_Retry on
+    the batch, so each one is handled here.  Not found maps to None, rate
+    limits and server errors are retried one call at a time via API_Retry,
+    anything else is raised.
+
+    Args:
+      jobs: request id to an unexecuted API call, see execute(run = False).
+
+    Returns:
+      Dictionary of request id to response, None for calls not found.
+
+    Raises:
+      HttpError: for any call that failed other than not found.
+    """
+
+    responses = {}
+    failed = {}
+
+    def callback(request_id, response, exception):
+      if exception is None:
+        responses[request_id] = response
+      else:
+        failed[request_id] = exception
+
+    service = get_service(
+      config = self.config,
+      api = 'drive',
+      version = 'v3',
+      auth = self.auth
+    )
+
+    pending = iter(jobs.items())
+    for chunk in iter(lambda: list(itertools.islice(pending, DRIVE_BATCH_SIZE)), []):
+      batch = service.new_batch_http_request(callback = callback)
+      for request_id, job in chunk:
+        batch.add(job, request_id = request_id)
+      API_Retry(batch)
+
+    for request_id, exception in failed.items():
+      if not retriable_http_error(exception):
+        if isinstance(exception, HttpError) and exception.resp.status == 404:
+          responses[request_id] = None
+          continue
+        raise exception
+
+      try:
+        responses[request_id] = API_Retry(jobs[request_id])
+      except HttpError as e:
+        if e.resp.status != 404:
+          raise
+        responses[request_id] = None
+
+    return responses
+
+  def file_delete_batch(self, names: Sequence[str]) -> Mapping[str, bool]:
+    """Helper for deleting many files by url, name, or id in batch requests.
+
+    Args:
+      names: the urls, names, or IDs of the files.
+
+    Returns:
+      Dictionary of each input to True if it existed and was deleted.
+
+    Raises:
+      HttpError: if any delete fails for a reason other than not found.
+    """
+
+    drive_ids = self.file_ids(names)
+    deleted = self._batch_execute({
+      drive_id: API_Drive(
+        config = self.config,
+        auth = self.auth
+      ).files().delete(fileId = drive_id).execute(run = False)
+      for drive_id in filter(None, drive_ids.values())
+    })
+
+    results = {}
+    for name, drive_id in drive_ids.items():
+      # delete responds with an empty body, not found comes back as None
+      results[name] = drive_id in deleted and deleted[drive_id] is not None
+      if results[name]:
+        self.file_find_clear(name, drive_id)
+    return results
+
+  def file_create_batch(
+    self,
+    names: Sequence[str],
+    parent: str = None,
+    mimetype: str = None
+  ) -> Mapping[str, Mapping[str, Any]]:
+    """Helper for creating many empty files or folders in batch requests.
+
+    Only metadata is sent, Drive does not batch media uploads, use
+    file_create for files with content.  Unlike file_create existing files
+    are not checked, every name is created.
+
+    Args:
+      names: names of the files to create.
+      parent: the Google Drive ID to create the files in.
+      mimetype: for example application/vnd.google-apps.folder.
+
+    Returns:
+      Dictionary of each name to its new file id JSON.
+
+    Raises:
+      HttpError: if any create fails after retries.
+    """
+
+    names = list(dict.fromkeys(names))
+    created = self._batch_execute({
+      str(index): API_Drive(
+        config = self.config,
+        auth = self.auth
+      ).files().create(
+        body = {
+          'name': name,
+          'parents': [parent] if parent else [],
+          'mimeType': mimetype or _guess_type(name)
+        },
+        fields = 'id'
+      ).execute(run = False)
+      for index, name in enumerate(names)
+    })
+
+    for name in names:
+      self.file_find_clear(name)
+    return {name: created.get(str(index)) for index, name in enumerate(names)}
+
+  def file_exists_many(
+    self,
+    urls_or_names: Sequence[str]
+  ) -> Mapping[str, bool]:
+    """Helper for checking many files exist by url, name, or id."""
+    return {
+      url_or_name: drive_file is not None
+      for url_or_name, drive_file in self.file_get_many(urls_or_names).items()
+    }
+
   def file_list(
     self,
     parent: str = None
   ) -> Iterator[Mapping[str, Any]]:
     """Helper for listing existing files."""
-    query = 'trashed = false'
+    query = DRIVE_QUERY
     if parent:
-      query = '%s and "%s" in parents' % (query, parent)
+      query = '%s and "%s" in parents' % (query, _query_escape(parent))
     yield from API_Drive(
       config = self.config,
       auth = self.auth,
       iterate = True
-    ).files().list(q = query).execute()
+    ).files().list(q = query, fields = DRIVE_LIST_FIELDS).execute()
 
   def file_find(
     self,
     name: str,
     parent: str = None
   ) -> Mapping[str, Any]:
-    """Helper for finding existing file by name only."""
-    query = 'trashed = false and name = "%s"' % name
+    """Helper for finding existing file by name only.
+
+    Found files are reused for FILE_CACHE_TTL seconds, workflows often name
+    the same file many times.  Helpers in this class that create or delete
+    files clear the affected names, changes made elsewhere can take up to
+    the TTL to be seen.
+    """
+
+    key = (self.auth, name, parent)
+    drive_file = _file_cache_get(self.config, key)
+    if drive_file:
+      return drive_file
+
+    query = '%s and name = "%s"' % (DRIVE_QUERY, _query_escape(name))
     if parent:
-      query = '%s and "%s" in parents' % (query, parent)
+      query = '%s and "%s" in parents' % (query, _query_escape(parent))
 
     try:
-      return next(API_Drive(
+      drive_file = next(API_Drive(
         config = self.config,
         auth = self.auth,
         iterate = True
-      ).files().list(q = query).execute())
+      ).files().list(q = query, fields = DRIVE_LIST_FIELDS).execute())
     except StopIteration:
       return None
 
+    _file_cache_put(self.config, key, drive_file)
+    return drive_file
+
+  def file_find_clear(self, name: str = None, drive_id: str = None) -> None:
+    """Drop cached file_find results matching a name or file id."""
+    cache = FILE_CACHE.get(self.config, {})
+    for key, (_, drive_file) in list(cache.items()):
+      if key[0] == self.auth and (
+        key[1] == name or drive_file.get('id') == drive_id
+      ):
+        cache.pop(key, None)
+
   def file_delete(self, name: str) -> bool:
     """Helper for deleting a file if it exists. Signals existence."""
     drive_id = self.file_id(name)
@@ -195,6 +503,7 @@ class Drive():
         config = self.config,
         auth = self.auth
       ).files().delete(fileId = drive_id).execute()
+      self.file_find_clear(name, drive_id)
       return True
 
     return False
@@ -214,17 +523,17 @@ class Drive():
     and attempts to map to Google native such as Docs, Sheets, Slides, etc...
 
     For example:
-      file_create('user','Sample Document','sample.txt',BytesIO('data'))
+      file_create('user','Sample Document','sample.txt',BytesIO(b'data'))
       Creates a Google Document object in the user's drive.
 
-      file_Create('user','Sample Sheet','sample.csv',BytesIO('c1,c2\nr1,r1\n'))
+      file_Create('user','Sample Sheet','sample.csv',BytesIO(b'c1,c2\nr1,r1\n'))
       Creates a Google Sheet object in the user's drive.
 
     See: https://developers.google.com/drive/api/v3/manage-uploads
 
     Args:
       name: name of file to create, used as key to check if file exists
-      data: any file like object that can be read from
+      data: bytes, str, or a seekable file like object that can be read from
       mimetype: explicitly specify the file type, auto detect if None.
       convert: attempt to convert to Google Drive Format like a doc.
       parent: the Google Drive ID to upload the file into
@@ -250,7 +559,7 @@ class Drive():
 
     # determine type
     if not mimetype:
-      mimetype = mimetypes.guess_type(name, strict = False)[0]
+      mimetype = _guess_type(name)
       if convert:
         # drive mime attempts to map to a native Google format
         mimetype = self.about(
@@ -268,7 +577,7 @@ class Drive():
     }
 
     media = MediaIoBaseUpload(
-      BytesIO(data or ' '),  # if data is empty BAD REQUEST error occurs
+      _as_stream(data),
       mimetype = mimetype,
       chunksize = DRIVE_CHUNKSIZE,
       resumable = True
@@ -278,6 +587,7 @@ class Drive():
       config = self.config,
       auth = self.auth
     ).files().create(body = body, media_body = media, fields = 'id').execute()
+    self.file_find_clear(name)
 
     return drive_file
 
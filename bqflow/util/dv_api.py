@@ -18,21 +18,33 @@
 
 import re
 import time
+import weakref
 
 from collections.abc import Iterator
+from gzip import GzipFile
 from typing import Any, List, Union
 from types import GeneratorType
-from urllib.request import urlopen
+from urllib.request import Request, urlopen
+
+from googleapiclient.errors import HttpError
 
 from bqflow.util.configuration import Configuration
-from bqflow.util.csv import column_header_sanitize, csv_to_rows, rows_to_csv, response_utf8_stream
+from bqflow.util.csv import column_header_sanitize, csv_to_rows, rows_to_csv
 from bqflow.util.data import get_rows
 from bqflow.util.google_api import API_DBM
 from bqflow.util.misc import memory_scale
 
 
-DBM_CHUNKSIZE = memory_scale(maximum=200 * 1024**3, multiple=256 * 1024)
+DBM_CHUNKSIZE = memory_scale(maximum=64 * 1024**2, multiple=256 * 1024) # bytes read per chunk
+DBM_PAGE_SIZE = 100 # largest page queries.list allows
+DBM_POLL_WAIT = 5 # seconds, doubled on every poll
+DBM_POLL_WAIT_MAX = 60 # seconds
+QUERY_CACHE = weakref.WeakKeyDictionary() # store config -> {(auth, title): queryId}
 RE_FILENAME = re.compile(r'.*/(.*)\?GoogleAccess')
+RE_DATE = re.compile(r'\A\d{4}/\d{2}/\d{2}\Z')
+
+# store stripped cell -> replacement
+CLEAN_CELLS = {'Unknown': '', '-': '', '< 1000': '1000'}
 
 def report_get(
   config: Configuration,
@@ -52,11 +64,34 @@ def report_get(
   """
 
   if name:
-    for query in API_DBM(config, auth, iterate=True).queries().list().execute():
+    cache = QUERY_CACHE.setdefault(config, {})
+    key = (auth, name)
+
+    # titles seen before skip the scan, unless deleted or renamed since
+    if key in cache:
+      try:
+        query = API_DBM(config, auth).queries().get(
+          queryId=cache[key]
+        ).execute()
+        if query['metadata']['title'] == name:
+          return query
+      except HttpError as e:
+        if e.resp.status != 404:
+          raise
+      cache.pop(key, None)
+
+    # remember only the title asked for, the cache grows with lookups
+    for query in API_DBM(config, auth, iterate=True).queries().list(
+      pageSize=DBM_PAGE_SIZE,
+      fields='queries(queryId,metadata/title),nextPageToken'
+    ).execute():
       if query['metadata']['title'] == name:
-        return query
-  else:
-    return API_DBM(config, auth).queries().get(queryId=report_id).execute()
+        report_id = cache[key] = query['queryId']
+        break
+    else:
+      return None
+
+  return API_DBM(config, auth).queries().get(queryId=report_id).execute()
 
 def report_filter(
   config: Configuration,
@@ -154,6 +189,9 @@ def report_build(
     report = API_DBM(config, auth).queries().create(
       body=body
     ).execute()
+    QUERY_CACHE.setdefault(config, {})[
+      (auth, body['metadata']['title'])
+    ] = report['queryId']
 
     # run report first time
     API_DBM(config, auth).queries().run(
@@ -177,8 +215,8 @@ def report_fetch(
 ) -> Union[dict, bool]:
   """Retrieves most recent DBM file JSON by name or ID, if in progress, waits for it to complete.
 
-  Timeout is in minutes ( retries will happen at 5 minute interval, default
-  total time is 20 minutes )
+  Timeout is in minutes ( polls back off from 5 seconds to once a minute,
+  default total time is 60 minutes )
 
   Args:
     * auth: (string) Either user or service.
@@ -205,10 +243,10 @@ def report_fetch(
         print('MISSING REPORT')
       return False
 
-  # check file
-  while timeout >= 0:  # allow zero to execute at least once
-    timeout -= 1
-
+  # check file, zero timeout still checks once
+  deadline = time.monotonic() + timeout * 60
+  wait = DBM_POLL_WAIT
+  while True:
     try:
       report_file = next(API_DBM(
         config=config,
@@ -217,20 +255,15 @@ def report_fetch(
       ).queries().reports().list(
         queryId=report_id,
         orderBy='key.reportId desc',
-        pageSize=1
+        pageSize=1,
+        fields='reports(metadata/status/state,metadata/googleCloudStoragePath)'
       ).execute())
 
       if config.verbose:
         print('DBM Report Status:', report_file['metadata']['status']['state'])
 
-      # loop
-      if report_file['metadata']['status']['state'] in ('RUNNING', 'QUEUED'):
-        if config.verbose:
-          print('WAITING A MINUTE OF:', timeout)
-          time.sleep(60)
-
       # exit
-      elif report_file['metadata']['status']['state'] == 'DONE':
+      if report_file['metadata']['status']['state'] == 'DONE':
         return report_file['metadata']['googleCloudStoragePath']
 
       # exit
@@ -239,6 +272,16 @@ def report_fetch(
           print('FAILED REPORT')
         return False
 
+      # loop ( RUNNING, QUEUED ), never faster than the back off
+      remaining = deadline - time.monotonic()
+      if remaining <= 0:
+        break
+      wait = min(wait, remaining)
+      if config.verbose:
+        print('WAITING SECONDS / REMAINING:', wait, int(remaining))
+      time.sleep(wait)
+      wait = min(wait * 2, DBM_POLL_WAIT_MAX)
+
     # exit
     except StopIteration:
       break
@@ -280,11 +323,20 @@ def report_run(
     if report is None:
       raise Exception('Report does not exist:', name)
     else:
-      report_id = report['id']
+      report_id = report['queryId']
 
-  files = list(report_files(config, auth, report_id))
-  latest_file_json = files[0] if len(files) > 0 else None
-  if latest_file_json == None or latest_file_json['metadata']['status']['state'] != 'PROCESSING':
+  # only the newest file matters, skip paging through the history
+  latest_file_json = next(API_DBM(
+    config=config,
+    auth=auth,
+    iterate=True
+  ).queries().reports().list(
+    queryId=report_id,
+    orderBy='key.reportId desc',
+    pageSize=1,
+    fields='reports(metadata/status/state)'
+  ).execute(), None)
+  if latest_file_json is None or latest_file_json['metadata']['status']['state'] not in ('RUNNING', 'QUEUED'):
     # run report if previously never run or currently not running
     if config.verbose:
       print('RUNNING REPORT', report_id or name)
@@ -326,6 +378,29 @@ def report_files(
       ).execute():
     yield report_file
 
+def _report_chunks(response: Any, chunksize: int) -> Iterator[str]:
+  """Decodes a byte stream in chunks that end on a line break.
+
+  A newline byte never occurs inside a multi byte UTF-8 character, so
+  splitting there keeps characters whole without scanning for boundaries,
+  and only the partial last line is carried into the next chunk.
+  """
+
+  buffer = bytearray()
+  while True:
+    data = response.read(chunksize)
+    if not data:
+      break
+    buffer += data
+    end = buffer.rfind(b'\n') + 1
+    if end:
+      yield buffer[:end].decode('UTF-8')
+      del buffer[:end]
+
+  if buffer:
+    yield buffer.decode('UTF-8')
+
+
 def report_file(
   config: Configuration,
   auth: str,
@@ -338,7 +413,8 @@ def report_file(
 
   Timeout is in minutes ( retries will happen at 1 minute interval, default
   total time is 60 minutes )
-  If chunksize is set to None then the whole file is downloaded at once.
+  The file is always streamed, a chunksize of None uses DBM_CHUNKSIZE.
+  Gzip encoded downloads are decompressed as they stream.
 
   Args:
     * auth: (string) Either user or service.
@@ -350,7 +426,6 @@ def report_file(
 
   Returns:
     * (filename, iterator) if file exists and is ready to download in chunks.
-    * (filename, file) if file exists and chunking is off.
     * ('report_running.csv', None) if report is in progress.
     * (None, None) if file does not exist.
 
@@ -365,17 +440,14 @@ def report_file(
   else:
     filename = RE_FILENAME.search(storage_path).groups(0)[0]
 
-    # streaming
-    if chunksize:
-      if config.verbose:
-        print('REPORT FILE STREAM:', storage_path)
-      return filename, response_utf8_stream(urlopen(storage_path), chunksize)
+    if config.verbose:
+      print('REPORT FILE STREAM:', storage_path)
 
-    # single object
-    else:
-      if config.verbose:
-        print('REPORT FILE SINGLE:', storage_path)
-      return filename, urlopen(storage_path).read().decode('UTF-8')
+    response = urlopen(Request(storage_path, headers={'Accept-Encoding': 'gzip'}))
+    if response.headers.get('Content-Encoding') == 'gzip':
+      response = GzipFile(fileobj=response)
+
+    return filename, _report_chunks(response, chunksize or DBM_CHUNKSIZE)
 
 
 def report_delete(
@@ -401,6 +473,7 @@ def report_delete(
   report = report_get(config, auth, report_id, name)
   if report:
     API_DBM(config, auth).queries().delete(queryId=report['queryId']).execute()
+    QUERY_CACHE.get(config, {}).pop((auth, report['metadata']['title']), None)
   else:
     if config.verbose:
       print('DBM DELETE: No Report')
@@ -412,8 +485,23 @@ def report_list(
 ) -> Iterator[dict]:
   """Lists all the DBM report configurations for the current credentials."""
 
-  for query in API_DBM(config, auth, iterate=True).queries().list().execute():
-    yield query
+  yield from API_DBM(config, auth, iterate=True).queries().list(
+    pageSize=DBM_PAGE_SIZE
+  ).execute()
+
+
+def _report_lines(chunks: Iterator[str]) -> Iterator[str]:
+  """Re-splits streamed text chunks into whole lines for the csv reader."""
+
+  leftovers = ''
+  for chunk in chunks:
+    lines = chunk.split('\n')
+    lines[0] = leftovers + lines[0]
+    leftovers = lines.pop()
+    for line in lines:
+      yield line + '\n'
+  if leftovers:
+    yield leftovers
 
 
 def report_to_rows(report: Iterator[list]) -> Iterator[list]:
@@ -434,14 +522,9 @@ def report_to_rows(report: Iterator[list]) -> Iterator[list]:
     * Iterator of lists representing each row.
   """
 
-  # if reading from stream
+  # if reading from stream, one csv reader spans all chunks
   if type(report) is GeneratorType:
-    leftovers = ''
-    for chunk in report:
-      data, extra = chunk.rsplit('\n', 1)
-      for row in csv_to_rows(leftovers + data):
-        yield row
-      leftovers = extra
+    yield from csv_to_rows(_report_lines(report))
 
   # if reading from buffer
   else:
@@ -480,6 +563,8 @@ def report_clean(
 
   print('DBM REPORT CLEAN')
 
+  is_date = RE_DATE.match
+  clean_cell = CLEAN_CELLS.get
   first = True
   for row in rows:
     # stop if no data returned
@@ -499,25 +584,17 @@ def report_clean(
           row[date_column] = 'Report_Day'
         except ValueError:
           pass
-        row = [column_header_sanitize(cell) for cell in row]
+        row = [clean_cell(cell.strip(), cell) for cell in map(column_header_sanitize, row)]
       else:
         continue
 
-    # for all data rows clean up cells
+    # for all data rows clean up cells in one pass, reformat data studio dates
+    # and remove unknown columns (which throw off schema on import types)
     else:
-      # check if data studio formatting is applied reformat the dates
       row = [
-        cell.replace('/', '-') if isinstance(cell, str) and len(cell) == 4 +
-        1 + 2 + 1 + 2 and cell[4] == '/' and cell[7] == '/' else cell
+        cell.replace('/', '-', 2) if is_date(cell) else clean_cell(cell.strip(), cell)
         for cell in row
-      ]  # 5x faster than regexp
-
-    # remove unknown columns (which throw off schema on import types)
-    row = [
-      '' if cell.strip() in ('Unknown', '-')
-      else ('1000' if cell == '< 1000' else cell)
-      for cell in row
-    ]
+      ]
 
     # return the row
     yield row
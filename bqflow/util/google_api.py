@@ -33,19 +33,24 @@ This does not change or augment the standard API calls other than the following:
 
 import base64
 from collections.abc import Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
 import datetime
-import json
+from email.utils import parsedate_to_datetime
+import random
 import time
 from typing import Any, Callable, Union
 import ssl
+import weakref
 
 from googleapiclient.errors import HttpError
 from googleapiclient.discovery import Resource
+from google_auth_httplib2 import AuthorizedHttp
 import httplib2
 from typing_extensions import Self
 
 from bqflow.util.configuration import Configuration
 from bqflow.util.auth import get_service
+from bqflow.util.json_fast import loads as json_loads
 
 try:
   import httplib
@@ -58,47 +63,105 @@ RETRIABLE_EXCEPTIONS = (httplib2.HttpLib2Error, IOError, httplib.NotConnected,
                         httplib.ResponseNotReady, httplib.BadStatusLine)
 
 RETRIABLE_STATUS_CODES = [500, 502, 503, 504]
+RETRIABLE_403_REASONS = ('rateLimitExceeded', 'userRateLimitExceeded')
+# store config -> {auth: {accountId: profileId}}, released with the config
+PROFILE_CACHE = weakref.WeakKeyDictionary()
+CLEAN_SKIP_TYPES = frozenset((str, int, float, bool, type(None))) # left as is by _clean
 
 
 def _clean(
   struct: Union[Mapping[str, Any], Sequence[Any]]
 ) -> Union[Mapping[str, Any], Sequence[Any]]:
-  """Helper to recursively clean up JSON data for API call.
+  """Helper to clean up JSON data for API call, walks nested dicts and lists.
 
   Converts bytes -> base64.
   Converts date -> str (yyyy-mm-dd).
 
   Args:
-    struct: The kwargs being cleaned up.
+    struct: The kwargs being cleaned up, modified in place.
 
   Returns:
     The kwargs with replacments.
   """
 
-  if isinstance(struct, list):
-    for key, value in struct.items():
-      if isinstance(value, bytes):
-        struct[key] = base64.standard_b64encode(value).decode("ascii")
+  encode = base64.standard_b64encode
+  stack = [struct] if isinstance(struct, (dict, list)) else []
+  while stack:
+    node = stack.pop()
+    for key, value in node.items() if isinstance(node, dict) else enumerate(node):
+      # most leaves are plain JSON, one set lookup skips the checks below
+      if type(value) in CLEAN_SKIP_TYPES:
+        continue
+      elif type(value) is bytes:
+        node[key] = encode(value).decode('ascii')
       elif isinstance(value, datetime.date):
-        struct[key] = str(value)
-      else:
-        _clean(value)
-  elif isinstance(struct, list):
-    for index, value in enumerate(struct):
-      if isinstance(value, bytes):
-        struct[index] = base64.standard_b64encode(value).decode("ascii")
-      elif isinstance(value, datetime.date):
-        struct[index] = str(value)
-      else:
-        _clean(value)
+        node[key] = str(value)
+      elif isinstance(value, (dict, list)):
+        stack.append(value)
   return struct
 
 
+def _retry_after(response: Mapping[str, str]) -> float:
+  """Seconds the server asked to wait in Retry-After, None if not given."""
+
+  value = response.get('retry-after')
+  if value:
+    if value.isdigit():
+      return int(value)
+    try:
+      return max(0, (
+        parsedate_to_datetime(value)
+        - datetime.datetime.now(datetime.timezone.utc)
+      ).total_seconds())
+    except (TypeError, ValueError):
+      pass
+  return None
+
+
+def _error_content(error: HttpError) -> Mapping[str, Any]:
+  """The 'error' object of an HttpError body, empty if unreadable."""
+
+  # proxies can answer with html, treat an unreadable body as no details
+  try:
+    content = json_loads(error.content).get('error', {})
+  except (ValueError, AttributeError):
+    content = {}
+
+  # OAuth style bodies carry a string, { "error": "invalid_request" }
+  if not isinstance(content, dict):
+    content = {}
+  return content
+
+
+def retriable_http_error(error: Exception) -> bool:
+  """True if API_Retry would retry the error: 429, 500, 503, rate limit 403.
+
+  Permission and disabled account errors never recover so are not retriable.
+  Also used for per call errors inside batch requests, which API_Retry on the
+  batch itself never sees.
+  """
+
+  if not isinstance(error, HttpError):
+    return False
+  if error.resp.status not in (403, 429, 500, 503):
+    return False
+
+  content = _error_content(error)
+  reason = (content.get('errors') or [{}])[0].get('reason')
+  return not (
+    content.get('status') == 'PERMISSION_DENIED'
+    or reason in ('forbidden', 'accountDisabled')
+    or (error.resp.status == 403 and reason not in RETRIABLE_403_REASONS)
+  )
+
+
 def API_Retry(
   job: Any,
   key: str = None,
   retries: int = 3,
-  wait: int = 31
+  wait: int = 31,
+  cap: int = 90,
+  timeout: int = 270
 ) -> Any:
   """API retry that includes back off and some common error handling.
 
@@ -106,11 +169,14 @@ def API_Retry(
   all future calls.
 
   For critical but recoverable errors, the back off executes [retry] times.
-  Each time the [wait] is doubled.
-  By default retries are: 0:31 + 1:02 + 2:04 = 3:37 (minutes)
+  Each wait is random between [wait] and three times the prior wait, up to
+  [cap], so concurrent workflows do not retry in step and collide again.
+  A Retry-After header from the server replaces the computed wait.
+  No retry starts past [timeout] seconds from the first call.
+  By default retries take between 1:33 and 4:30 (minutes) in total.
   The recommended minimum wait is 60 seconds for most APIs.
 
-  - Errors retried: 429, 500, 503
+  - Errors retried: 429, 500, 503, 403 (rate limit reasons only)
   - Errors ignored: 409 - already exists (for create only and returns None)
   - Errors raised: ALL OTHERS
 
@@ -118,7 +184,9 @@ def API_Retry(
     job: API call path, everything before the execute() statement to retry.
     key: Optional key from json reponse to return.
     retries: Number of times to try the job.
-    wait: Time to wait in seconds between retries.
+    wait: Minimum time to wait in seconds between retries.
+    cap: Maximum time to wait in seconds between retries.
+    timeout: Seconds after which no further retry is started.
 
   Returns:
     JSON result of job or key value from JSON result if job succeed.
@@ -128,61 +196,66 @@ def API_Retry(
     - Any exceptions not listed in comments above.
   """
 
-  try:
-    # try to run the job and return the response
-    data = job.execute()
-    return data if not key else data.get(key, [])
-
-  # API errors
-  except HttpError as e:
-    # errors that can be overcome or re-tried (403 is rate limit with inspect)
-    if e.resp.status in [403, 409, 429, 500, 503]:
-      content = json.loads(e.content.decode())
+  cap = max(cap, wait)
+  sleep = wait
+  deadline = time.monotonic() + timeout
+  for retries in range(retries, -1, -1):
+    retry_after = None
+    try:
+      # try to run the job and return the response
+      data = job.execute()
+      return data if not key else data.get(key, [])
+
+    # API errors
+    except HttpError as e:
       # already exists (ignore benign)
-      if content['error']['code'] == 409:
+      if e.resp.status == 409:
         return None
-      # permission denied (won't change on retry so raise)
-      elif (
-        content.get('error', {}).get('status') == 'PERMISSION_DENIED'
-        or content.get('error', {}).get('errors', [{}])[0].get('reason')
-        in ('forbidden', 'accountDisabled')
-      ):
-        print('ERROR DETAILS:', e.content.decode())
-        raise
-      elif retries > 0:
+
+      # rate limits and server errors can be re-tried while retries remain
+      elif retriable_http_error(e) and retries > 0:
         print('API ERROR:', str(e))
-        print('API RETRY / WAIT:', retries, wait)
-        time.sleep(wait)
-        return API_Retry(job, key, retries - 1, wait * 2)
-      # if no retries, raise
+        label, error, retry_after = 'API', e, _retry_after(e.resp)
+
+      # permission denied, quota gone, or out of retries
+      elif e.resp.status in (403, 429, 500, 503):
+        print('ERROR DETAILS:', e.content.decode(errors='replace'))
+        raise
+
+      # raise all other errors that cannot be overcome
       else:
-        print('ERROR DETAILS:', e.content.decode())
         raise
-    # raise all other errors that cannot be overcome
-    else:
-      raise
-
-  # HTTP transport errors
-  except RETRIABLE_EXCEPTIONS as e:
-    if retries > 0:
-      print('HTTP ERROR:', str(e))
-      print('HTTP RETRY / WAIT:', retries, wait)
-      time.sleep(wait)
-      return API_Retry(job, key, retries - 1, wait * 2)
-    else:
-      raise
-
-  # SSL timeout errors
-  except ssl.SSLError as e:
-    # most SSLErrors are not retriable, only timeouts, but
-    # SSLError has no good error type attribute, so we search the message
-    if retries > 0 and 'timed out' in e.message:
-      print('SSL ERROR:', str(e))
-      print('SSL RETRY / WAIT:', retries, wait)
-      time.sleep(wait)
-      return API_Retry(job, key, retries - 1, wait * 2)
+
+    # HTTP transport errors
+    except RETRIABLE_EXCEPTIONS as e:
+      if retries > 0:
+        print('HTTP ERROR:', str(e))
+        label, error = 'HTTP', e
+      else:
+        raise
+
+    # SSL timeout errors
+    except ssl.SSLError as e:
+      # most SSLErrors are not retriable, only timeouts, but
+      # SSLError has no good error type attribute, so we search the message
+      if retries > 0 and 'timed out' in str(e):
+        print('SSL ERROR:', str(e))
+        label, error = 'SSL', e
+      else:
+        raise
+
+    # server knows best, otherwise decorrelated jitter spreads retries apart
+    if retry_after is not None:
+      sleep = retry_after
     else:
-      raise
+      sleep = min(cap, random.uniform(wait, sleep * 3))
+
+    if time.monotonic() + sleep > deadline:
+      print(label, 'RETRY TIMEOUT:', timeout)
+      raise error
+
+    print(label, 'RETRY / WAIT:', retries, round(sleep))
+    time.sleep(sleep)
 
 
 class API_Iterator_Instance():
@@ -218,6 +291,9 @@ class API_Iterator_Instance():
    kwargs: arguments to pass to fucntion when making call.
    results: optional / used recursively, prior call results to continue.
    limit: maximum number of records to return
+   prefetch: fetch the next page in the background once the last record of
+     a page is returned, the fetch uses its own connection.  Call close() to
+     release it when stopping early, garbage collection also closes it.
 
   Returns:
     Iterator over JSON objects or Mapping or other depending on API.
@@ -228,7 +304,8 @@ class API_Iterator_Instance():
     function: str,
     kwargs: Mapping[str, Any],
     results: Mapping[str, Any]=None,
-    limit: int = None
+    limit: int = None,
+    prefetch: bool = False
   ):
     self.function = function
     self.kwargs = kwargs
@@ -237,6 +314,10 @@ class API_Iterator_Instance():
     self.position = 0
     self.count = 0
     self.iterable = None
+    self.prefetch = prefetch
+    self.executor = None
+    self.future = None
+    self.http = None
     self.__find_tag__()
 
   def __find_tag__(self):
@@ -273,15 +354,15 @@ class API_Iterator_Instance():
       page_token = self.results.get('nextPageToken', None)
       if page_token:
 
-        if 'body' in self.kwargs:
-          self.kwargs['body']['pageToken'] = page_token
+        if self.future and self.future[0] == page_token:
+          self.results = self.future[1].result()
         else:
-          self.kwargs['pageToken'] = page_token
-
-        self.results = API_Retry(self.function(**self.kwargs))
+          self.results = self.__fetch__(page_token)
+        self.future = None
         self.position = 0
 
       else:
+        self.close()
         raise StopIteration
 
     # if results remain, return them (sometimes the iterable is missing)
@@ -291,10 +372,19 @@ class API_Iterator_Instance():
       value = self.results[self.iterable][self.position]
       self.position += 1
 
+      # caller is on the last record, overlap its work with the next page
+      if (
+        self.prefetch
+        and self.future is None
+        and self.position == len(self.results[self.iterable])
+      ):
+        self.__prefetch__()
+
       # if reached limit, stop
       if self.limit is not None:
         self.count += 1
         if self.count > self.limit:
+          self.close()
           raise StopIteration
 
       # otherwise return next value
@@ -302,18 +392,68 @@ class API_Iterator_Instance():
 
     # if pages and results exhausted, stop
     else:
+      self.close()
       raise StopIteration
 
+  def __del__(self):
+    self.close()
+
+  def close(self):
+    # release the prefetch thread and connection, safe to call more than once
+    if self.future:
+      self.future[1].cancel()
+      self.future = None
+    if self.executor:
+      self.executor.shutdown(wait=False)
+      self.executor = None
+    if self.http:
+      getattr(self.http, 'close', lambda: None)()
+      self.http = None
+    self.prefetch = False
+
+  def __fetch__(self, page_token, http=None):
+    # copy arguments so a background fetch never races the caller
+    kwargs = dict(self.kwargs)
+    if 'body' in kwargs:
+      kwargs['body'] = dict(kwargs['body'], pageToken=page_token)
+    else:
+      kwargs['pageToken'] = page_token
+
+    job = self.function(**kwargs)
+    if http:
+      job.http = http
+    return API_Retry(job)
+
+  def __prefetch__(self):
+    page_token = self.results.get('nextPageToken', None)
+    if not page_token or self.limit is not None:
+      return
+
+    # httplib2 is not thread safe, the background fetch gets its own connection
+    if self.http is None:
+      credentials = getattr(self.function(**self.kwargs).http, 'credentials', None)
+      if credentials is None:
+        self.prefetch = False
+        return
+      self.http = AuthorizedHttp(credentials, http=httplib2.Http())
+      self.executor = ThreadPoolExecutor(max_workers=1)
+
+    self.future = (
+      page_token,
+      self.executor.submit(self.__fetch__, page_token, self.http)
+    )
+
 
 def API_Iterator(
   function: Callable,
   kwargs: Mapping[str, Any],
   results: Mapping[str, Any]=None,
-  limit: int = None
+  limit: int = None,
+  prefetch: bool = False
 ) -> Any:
   """See API_Iterator_Instance for documentaion, this is an iter wrapper."""
 
-  return iter(API_Iterator_Instance(function, kwargs, results, limit))
+  return iter(API_Iterator_Instance(function, kwargs, results, limit, prefetch))
 
 
 class API():
@@ -330,14 +470,16 @@ class API():
     "api":"doubleclickbidmanager",
     "version": "v1.1",
     "auth": "user",
-    "iterate": False
+    "iterate": False,
+    "prefetch": False
   }
   api = API(config, api).placements().list(profile_id = 1234,
   archived = False).execute()
 
   Args:
     config: see example above, configures all authentication parameters
-    api: see example above, configures all API parameters
+    api: see example above, configures all API parameters, prefetch loads the
+      next page in the background while iterating
 
   Returns:
     If nextpageToken in result or iterate is True: return iterator of API
@@ -357,6 +499,7 @@ class API():
     self.function_kwargs = _clean(api.get('kwargs', {}))
     self.iterate = api.get('iterate', False)
     self.limit = api.get('limit')
+    self.prefetch = api.get('prefetch', False)
     self.headers = api.get('headers', {})
 
     self.function = None
@@ -367,15 +510,16 @@ class API():
   def __str__(self) -> str:
     return '%s.%s.%s' % (self.api, self.version, '.'.join(self.function_stack))
 
-  # builds API function stack
-  def __getattr__(self, function_name: str) -> Self:
+  # builds API function stack, private and dunder probes are not API calls
+  def __getattr__(self, function_name: str) -> Callable[..., Self]:
+    if function_name.startswith('_'):
+      raise AttributeError(function_name)
     self.function_stack.append(function_name)
+    return self._function_call
 
-    def function_call(**kwargs):
-      self.function_kwargs = _clean(kwargs)
-      return self
-
-    return function_call
+  def _function_call(self, **kwargs: Mapping[str, Any]) -> Self:
+    self.function_kwargs = _clean(kwargs)
+    return self
 
   def call(self, function_chain: str) -> Self:
     """For calling function via string (chain using dot notation).
@@ -454,7 +598,8 @@ class API():
           self.function,
           self.function_kwargs,
           self.response,
-          limit or self.limit
+          limit or self.limit,
+          self.prefetch
         )
 
       # if basic response, return object as is
@@ -528,14 +673,23 @@ class _API_DFAReporting(API):
     """
 
     if 'accountId' in self.function_kwargs:
-      for profile in API_DCM(
-        config = self.config,
-        auth = self.auth,
-        iterate = True
-      ).userProfiles().list().execute():
-        if profile['accountId'] == str(self.function_kwargs['accountId']):
-          self.function_kwargs['profileId'] = profile['profileId']
-          del self.function_kwargs['accountId']
+      account_id = str(self.function_kwargs['accountId'])
+      cache = PROFILE_CACHE.setdefault(self.config, {})
+
+      # list profiles once per credentials, again only for an unknown account
+      if account_id not in cache.get(self.auth, {}):
+        profiles = {}
+        for profile in API_DCM(
+          config = self.config,
+          auth = self.auth,
+          iterate = True
+        ).userProfiles().list().execute():
+          profiles.setdefault(profile['accountId'], profile['profileId'])
+        cache[self.auth] = profiles
+
+      if account_id in cache[self.auth]:
+        self.function_kwargs['profileId'] = cache[self.auth][account_id]
+        del self.function_kwargs['accountId']
 
     if 'accountId' in self.function_kwargs:
       raise AttributeError(
@@ -558,10 +712,14 @@ def API_Auto(
     return API(config, api)
 
 
-class API_BigQuery(API):
-  """BigQuery helper for Google API.  Defines agreed upon version.
+class API_Fixed(API):
+  """Base for helpers that pin one API and version, set NAME and VERSION.
+
+  Subclasses only declare the two class attributes, the constructor is shared.
   """
 
+  NAME, VERSION = None, None
+
   def __init__(
     self,
     config: Configuration,
@@ -571,372 +729,145 @@ class API_BigQuery(API):
     super().__init__(
       config = config,
       api = {
-        'api': 'bigquery',
-        'version': 'v2',
+        'api': self.NAME,
+        'version': self.VERSION,
         'auth': auth,
         'iterate': iterate
     })
 
 
-class API_SecretManager(API):
+class API_BigQuery(API_Fixed):
+  """BigQuery helper for Google API.  Defines agreed upon version.
+  """
+
+  NAME, VERSION = 'bigquery', 'v2'
+
+
+class API_SecretManager(API_Fixed):
   """SecretManager helper for Google API.  Defines agreed upon version.
   """
 
-  def __init__(
-    self,
-    config: Configuration,
-    auth: str,
-    iterate: bool = False
-  ) -> None:
-    super().__init__(
-      config = config,
-      api = {
-        'api': 'secretmanager',
-        'version': 'v1',
-        'auth': auth,
-        'iterate': iterate
-    })
+  NAME, VERSION = 'secretmanager', 'v1'
 
 
-class API_DBM(API):
+class API_DBM(API_Fixed):
   """DBM helper for Google API.  Defines agreed upon version.
   """
 
-  def __init__(
-    self,
-    config: Configuration,
-    auth: str,
-    iterate: bool = False
-  ) -> None:
-    super().__init__(
-      config = config,
-      api = {
-        'api': 'doubleclickbidmanager',
-        'version': 'v2',
-        'auth': auth,
-        'iterate': iterate
-    })
+  NAME, VERSION = 'doubleclickbidmanager', 'v2'
 
 
-class API_Sheets(API):
+class API_Sheets(API_Fixed):
   """DBM helper for Google API.  Defines agreed upon version.
   """
 
-  def __init__(
-    self,
-    config: Configuration,
-    auth: str,
-    iterate: bool = False
-  ) -> None:
-    super().__init__(
-      config = config,
-      api = {
-        'api': 'sheets',
-        'version': 'v4',
-        'auth': auth,
-        'iterate': iterate
-    })
+  NAME, VERSION = 'sheets', 'v4'
 
 
-class API_DCM(API):
+class API_DCM(API_Fixed):
   """DCM helper for Google API.  Defines agreed upon version.
   """
 
-  def __init__(
-    self,
-    config: Configuration,
-    auth: str,
-    iterate: bool = False
-  ) -> None:
-    super().__init__(
-      config = config,
-      api = {
-        'api': 'dfareporting',
-        'version': 'v4',
-        'auth': auth,
-        'iterate': iterate
-    })
+  NAME, VERSION = 'dfareporting', 'v4'
 
 
-class API_Datastore(API):
+class API_Datastore(API_Fixed):
   """Datastore helper for Google API.  Defines agreed upon version.
   """
 
-  def __init__(
-    self,
-    config: Configuration,
-    auth: str,
-    iterate: bool = False
-  ) -> None:
-    super().__init__(
-      config = config,
-      api = {
-        'api': 'datastore',
-        'version': 'v1',
-        'auth': auth,
-        'iterate': iterate
-    })
+  NAME, VERSION = 'datastore', 'v1'
 
 
-class API_StackDriver(API):
+class API_StackDriver(API_Fixed):
   """StackDriver helper for Google API.  Defines agreed upon version.
   """
 
-  def __init__(
-    self,
-    config: Configuration,
-    auth: str,
-    iterate: bool = False
-  ) -> None:
-    super().__init__(
-      config = config,
-      api = {
-        'api': 'logging',
-        'version': 'v2',
-        'auth': auth,
-        'iterate': iterate
-    })
+  NAME, VERSION = 'logging', 'v2'
 
 
-class API_PubSub(API):
+class API_PubSub(API_Fixed):
   """PubSub helper for Google API.  Defines agreed upon version.
   """
 
-  def __init__(
-    self,
-    config: Configuration,
-    auth: str,
-    iterate: bool = False
-  ) -> None:
-    super().__init__(
-      config = config,
-      api = {
-        'api': 'pubsub',
-        'version': 'v1',
-        'auth': auth,
-        'iterate': iterate
-    })
+  NAME, VERSION = 'pubsub', 'v1'
 
 
-class API_SearchAds(API):
+class API_SearchAds(API_Fixed):
   """Search Ads helper Google API.  Defines agreed upon version.
   """
 
-  def __init__(
-    self,
-    config: Configuration,
-    auth: str,
-    iterate: bool = False
-  ) -> None:
-    super().__init__(
-      config = config,
-      api = {
-        'api': 'doubleclicksearch',
-        'version': 'v2',
-        'auth': auth,
-        'iterate': iterate
-    })
+  NAME, VERSION = 'doubleclicksearch', 'v2'
 
 
-class API_Analytics(API):
+class API_Analytics(API_Fixed):
   """Analytics helper Google API.  Defines agreed upon version.
   """
 
-  def __init__(
-    self,
-    config: Configuration,
-    auth: str,
-    iterate: bool = False
-  ) -> None:
-    super().__init__(
-      config = config,
-      api = {
-        'api': 'analytics',
-        'version': 'v3',
-        'auth': auth,
-        'iterate': iterate
-    })
+  NAME, VERSION = 'analytics', 'v3'
 
 
-class API_AnalyticsReporting(API):
+class API_AnalyticsReporting(API_Fixed):
   """AnalyticsReporting helper Google API.  Defines agreed upon version.
   """
 
-  def __init__(
-    self,
-    config: Configuration,
-    auth: str,
-    iterate: bool = False
-  ) -> None:
-    super().__init__(
-      config = config,
-      api = {
-        'api': 'analyticsreporting',
-        'version': 'v4',
-        'auth': auth,
-        'iterate': iterate
-    })
+  NAME, VERSION = 'analyticsreporting', 'v4'
 
 
-class API_YouTube(API):
+class API_YouTube(API_Fixed):
   """YouTube helper Google API.  Defines agreed upon version.
   """
 
-  def __init__(
-    self,
-    config: Configuration,
-    auth: str,
-    iterate: bool = False
-  ) -> None:
-    super().__init__(
-      config = config,
-      api = {
-        'api': 'youtube',
-        'version': 'v3',
-        'auth': auth,
-        'iterate': iterate
-    })
+  NAME, VERSION = 'youtube', 'v3'
 
 
-class API_Drive(API):
+class API_Drive(API_Fixed):
   """Drive helper Google API.  Defines agreed upon version.
   """
 
-  def __init__(
-    self,
-    config: Configuration,
-    auth: str,
-    iterate: bool = False
-  ) -> None:
-    super().__init__(
-      config = config,
-      api = {
-        'api': 'drive',
-        'version': 'v3',
-        'auth': auth,
-        'iterate': iterate
-    })
+  NAME, VERSION = 'drive', 'v3'
 
 
-class API_Cloud(API):
+class API_Cloud(API_Fixed):
   """Cloud project helper Google API.  Defines agreed upon version.
   """
 
-  def __init__(
-    self,
-    config: Configuration,
-    auth: str,
-    iterate: bool = False
-  ) -> None:
-    super().__init__(
-      config = config,
-      api = {
-        'api': 'cloudresourcemanager',
-        'version': 'v1',
-        'auth': auth,
-        'iterate': iterate
-    })
+  NAME, VERSION = 'cloudresourcemanager', 'v1'
 
 
-class API_DV360(API):
+class API_DV360(API_Fixed):
   """Cloud project helper Google API.  Defines agreed upon version.
   """
 
-  def __init__(
-    self,
-    config: Configuration,
-    auth: str,
-    iterate: bool = False
-  ) -> None:
-    super().__init__(
-      config = config,
-      api = {
-        'api': 'displayvideo',
-        'version': 'v2',
-        'auth': auth,
-        'iterate': iterate
-    })
+  NAME, VERSION = 'displayvideo', 'v2'
 
 
-class API_Storage(API):
+class API_Storage(API_Fixed):
   """Cloud storage helper Google API.  Defines agreed upon version.
   """
 
-  def __init__(
-    self,
-    config: Configuration,
-    auth: str,
-    iterate: bool = False
-  ) -> None:
-    super().__init__(
-      config = config,
-      api = {
-        'api': 'storage',
-        'version': 'v1',
-        'auth': auth,
-        'iterate': iterate
-    })
+  NAME, VERSION = 'storage', 'v1'
 
 
-class API_Gmail(API):
+class API_Gmail(API_Fixed):
   """Gmail helper Google API.  Defines agreed upon version.
   """
 
-  def __init__(
-    self,
-    config: Configuration,
-    auth: str,
-    iterate: bool = False
-  ) -> None:
-    super().__init__(
-      config = config,
-      api = {
-        'api': 'gmail',
-        'version': 'v1',
-        'auth': auth,
-        'iterate': iterate
-    })
+  NAME, VERSION = 'gmail', 'v1'
 
 
-class API_Compute(API):
+class API_Compute(API_Fixed):
   """Compute helper Google API. Defines agreed upon version.
 
   https://cloud.google.com/compute/docs/reference/rest/v1/
   """
 
-  def __init__(
-    self,
-    config: Configuration,
-    auth: str,
-    iterate: bool = False
-  ) -> None:
-    super().__init__(
-      config = config,
-      api = {
-        'api': 'compute',
-        'version': 'v1',
-        'auth': auth,
-        'iterate': iterate
-    })
+  NAME, VERSION = 'compute', 'v1'
 
 
-class API_Vision(API):
+class API_Vision(API_Fixed):
   """Vision helper Google API. Defines agreed upon version.
 
   https://cloud.google.com/vision/docs/reference/rest
   """
 
-  def __init__(
-    self,
-    config: Configuration,
-    auth: str,
-    iterate: bool = False
-  ) -> None:
-    super().__init__(
-      config = config,
-      api = {
-        'api': 'vision',
-        'version': 'v1',
-        'auth': auth,
-        'iterate': iterate
-    })
+  NAME, VERSION = 'vision', 'v1'
@@ -0,0 +1,36 @@
+###########################################################################
+#
+#  Copyright 2024 Google LLC
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+###########################################################################
+
+"""Optional orjson support shared by the API helpers.
+
+Import orjson from here and test it for None before using orjson specific
+options, or call loads which falls back to the standard library.
+"""
+
+import json
+
+try:
+  import orjson
+except ImportError:
+  orjson = None
+
+
+def loads(data):
+  """Parse JSON str or bytes, using orjson if it is installed."""
+
+  return (orjson or json).loads(data)
@@ -4,6 +4,19 @@ from bqflow.util.bigquery_api import BigQuery
 from bqflow.util.data import put_rows
 
 LOG_HEADER = '{Timing: <30} {Status: <10} {Description: <50} {Parameters: <50}'
+LOG_TITLE = LOG_HEADER.format(
+  Timing='Timing',
+  Status='Status',
+  Description='Description',
+  Parameters='Parameters'
+)
+LOG_RULE = LOG_HEADER.format(
+  Timing='-' * 30,
+  Status='-' * 10,
+  Description='-' * 50,
+  Parameters='-' * 50
+)
+LOG_FLUSH_ROWS = 500 # buffered entries written at once, bounds memory and loss
 LOG_SCHEMA = [
   { 'name': 'Timing', 'type': 'TIMESTAMP', 'mode': 'REQUIRED' },
   { 'name': 'Status', 'type': 'STRING', 'mode': 'REQUIRED' },
@@ -35,6 +48,7 @@ class Log():
     self.config = config
     self.destination = destination or {}
     self.buffer = []
+    self.flushed = False
 
     if self.config.verbose:
       print('CREATING LOG')   
@@ -64,11 +78,24 @@ class Log():
 
 
   def __del__(self):
-    ''' Commit log buffer to destination as destructor.
+    ''' Commit remaining log buffer to destination as destructor.
     '''
+    self.flush()
+
+
+  def flush(self):
+    ''' Commit log buffer to destination and empty it.
+
+    The first write follows the destination disposition, later ones append so
+    a long workflow does not replace its own earlier entries.
+    '''
+
+    # nothing new, the first flush still runs so truncation clears the table
+    if self.flushed and not self.buffer:
+      return
 
     if self.config.verbose:
-      print('WRITING LOG', self.buffer)   
+      print('WRITING LOG', self.buffer)
 
     if 'bigquery' in self.destination:
       put_rows(
@@ -77,30 +104,32 @@ class Log():
         destination=self.destination,
         rows=self.buffer
       )
+      # copy so the recipe destination keeps its own disposition
+      self.destination = dict(self.destination)
+      self.destination['bigquery'] = dict(
+        self.destination['bigquery'],
+        disposition='WRITE_APPEND'
+      )
 
     else:
-      print()
-      print('Log')
-      print(LOG_HEADER.format(**{
-        'Timing':'Timing',
-        'Status':'Status',
-        'Description':'Description',
-        'Parameters':'Parameters',
-      }))
-      print(LOG_HEADER.format(**{
-        'Timing':'-' * 30,
-        'Status':'-' * 10,
-        'Description':'-' * 50,
-        'Parameters':'-' * 50
-      }))
+      if not self.flushed:
+        print()
+        print('Log')
+        print(LOG_TITLE)
+        print(LOG_RULE)
       for entry in self.buffer:
         entry['Parameters'] = ', '.join('{Key}:{Value}'.format(**p) for p in (entry['Parameters'] or []))
         print(LOG_HEADER.format(**entry))
       print()
 
+    self.buffer = []
+    self.flushed = True
+
 
   def write(self, status, description, parameters=None):
     """Writes to the local buffer, will be writen to destination in destructor.
+
+    Every LOG_FLUSH_ROWS entries the buffer is also written out early.
   
     Args:
       status (string): typically 'OK' or 'ERROR'
@@ -121,3 +150,6 @@ class Log():
       'Description': description,
       'Parameters': parameters
     })
+
+    if len(self.buffer) >= LOG_FLUSH_ROWS:
+      self.flush()
@@ -84,7 +84,7 @@ def has_values(o):
 def memory_scale(maximum, multiple=1, single_cpu=False):
   """Returns amount of memory in bytes avaialbe up to maximum.
 
-  Ensures memory is a multiple of provided numer.
+  Ensures memory is a multiple of provided numer, and at least one multiple.
   Divides memory by number of CPU.
 
   Args:
@@ -105,7 +105,7 @@ def memory_scale(maximum, multiple=1, single_cpu=False):
   if multiple and multiple != 1:
     memory = int(memory/multiple) * multiple
 
-  return min(maximum, memory)
+  return max(multiple, min(maximum, memory))
 
 
 def date_to_str(value):
@@ -16,10 +16,17 @@
 #
 ###########################################################################
 
+import datetime
 import unittest
 import io
 
-from csv import find_utf8_split, response_utf8_stream
+from bqflow.util.bigquery_api import SCHEMA_CACHE, get_schema
+from bqflow.util.bigquery_api import query_parameters, rows_to_records
+from bqflow.util.csv import find_utf8_split, response_utf8_stream
+from bqflow.util.discovery_to_bigquery import DOCUMENT_CACHE, acyclic_refs
+from bqflow.util.discovery_to_bigquery import Discovery_To_BigQuery
+from bqflow.util.dv_api import _report_chunks
+from bqflow.util.google_api import _clean
 
 
 class TestCSV(unittest.TestCase):
@@ -68,3 +75,239 @@ class TestCSV(unittest.TestCase):
     self.assertEqual(next(chunks), '路露魯鷺碌祿')
     self.assertEqual(next(chunks), '綠菉錄縷陋')
     self.assertEqual(next(chunks), '勒諒量')
+
+
+class TestGoogleAPI(unittest.TestCase):
+  """Test helpers that prepare API call arguments.
+  """
+
+  def test_clean(self):
+    """  Tests: _clean
+
+    Verify nested bytes and dates are converted in place and plain values kept.
+    """
+
+    struct = {
+      'name': 'Test',
+      'count': 3,
+      'active': True,
+      'empty': None,
+      'data': b'bqflow',
+      'day': datetime.date(2024, 1, 31),
+      'nested': [{'when': datetime.datetime(2024, 1, 31, 12, 30)}, [b'\x00']]
+    }
+
+    self.assertIs(_clean(struct), struct)
+    self.assertEqual(struct, {
+      'name': 'Test',
+      'count': 3,
+      'active': True,
+      'empty': None,
+      'data': 'YnFmbG93',
+      'day': '2024-01-31',
+      'nested': [{'when': '2024-01-31 12:30:00'}, ['AA==']]
+    })
+
+    # scalars are returned untouched
+    self.assertEqual(_clean('text'), 'text')
+
+
+class TestBigQuery(unittest.TestCase):
+  """Test BigQuery helpers that do not call the API.
+  """
+
+  def setUp(self):
+    SCHEMA_CACHE.clear()
+
+  def test_rows_to_records(self):
+    """  Tests: rows_to_records
+
+    Verify names come from schema first, then header, and that list rows
+    without any names raise instead of loading as empty records.
+    """
+
+    schema = [{'name': 'A', 'type': 'STRING'}, {'name': 'B', 'type': 'INTEGER'}]
+
+    self.assertEqual(
+      list(rows_to_records([['x', 1], {'A': 'y'}], schema)),
+      [{'A': 'x', 'B': 1}, {'A': 'y'}]
+    )
+
+    self.assertEqual(
+      list(rows_to_records([['First Name', 'Age'], ['x', 1]], header=True)),
+      [{'First_Name': 'x', 'Age': 1}]
+    )
+
+    self.assertEqual(
+      list(rows_to_records([['a', 'b'], ['x', 1]], schema, header=True)),
+      [{'A': 'x', 'B': 1}]
+    )
+
+    with self.assertRaises(ValueError):
+      list(rows_to_records([['x', 1]]))
+
+  def test_get_schema_cache(self):
+    """  Tests: get_schema, schema_cache_key
+
+    Verify a cache hit returns the same rows and schema as a miss, and that
+    infer_type and column count are part of the cache key.
+    """
+
+    rows = [['a', 'b'], [1, 'x'], [2]]
+
+    rows_miss, schema_miss = get_schema([list(r) for r in rows], cache=True)
+    rows_hit, schema_hit = get_schema([list(r) for r in rows], cache=True)
+
+    self.assertEqual(rows_miss, [['a', 'b'], [1, 'x'], [2, None]])
+    self.assertEqual(rows_hit, rows_miss)
+    self.assertIsInstance(rows_hit, list)
+    self.assertEqual(schema_hit, schema_miss)
+    self.assertEqual(schema_miss[0]['type'], 'INTEGER')
+    self.assertEqual(len(SCHEMA_CACHE), 1)
+
+    # returned schema is a copy, editing it does not change the cache
+    schema_hit[0]['type'] = 'STRING'
+    self.assertEqual(get_schema([list(r) for r in rows], cache=True)[1], schema_miss)
+
+    _, schema_string = get_schema([list(r) for r in rows], infer_type=False, cache=True)
+    self.assertEqual(schema_string[0]['type'], 'STRING')
+    self.assertEqual(len(SCHEMA_CACHE), 2)
+
+    self.assertEqual(get_schema([], cache=True), ([], []))
+
+  def test_query_parameters(self):
+    """  Tests: query_parameters
+
+    Verify named and positional parameters, including lists and missing values.
+    """
+
+    self.assertEqual(
+      query_parameters('SELECT * FROM {dataset}.{table}', {'dataset': 'D', 'table': 'T'}),
+      'SELECT * FROM D.T'
+    )
+
+    self.assertEqual(
+      query_parameters('SELECT * FROM T', None),
+      'SELECT * FROM T'
+    )
+
+    self.assertEqual(
+      query_parameters('SELECT * FROM T WHERE a=[PARAMETER] AND b IN ([PARAMETER])', [1, ['x', 'y']]),
+      'SELECT * FROM T WHERE a=1 AND b IN (x, y)'
+    )
+
+    with self.assertRaises(IndexError):
+      query_parameters('SELECT [PARAMETER], [PARAMETER]', [1])
+
+
+class TestDV(unittest.TestCase):
+  """Test DV360 report download helpers.
+  """
+
+  def test_report_chunks(self):
+    """  Tests: _report_chunks
+
+    Verify chunks always end on a line break and rejoin to the original text,
+    for chunk sizes that split multi byte characters.
+    """
+
+    text = 'Date,Name\n2024-01-31,豈更車\n2024-02-01,"a\nb"\n2024-02-02,⌀⌂'
+    data = text.encode('utf-8')
+
+    for chunksize in range(1, len(data) + 2):
+      chunks = list(_report_chunks(io.BytesIO(data), chunksize))
+      self.assertEqual(''.join(chunks), text)
+      for chunk in chunks[:-1]:
+        self.assertTrue(chunk.endswith('\n'))
+
+    self.assertEqual(list(_report_chunks(io.BytesIO(b''), 17)), [])
+
+
+class TestDiscovery(unittest.TestCase):
+  """Test discovery document expansion with recursive references.
+  """
+
+  DOCUMENT = {'schemas': {
+    'Node': {'properties': {
+      'id': {'type': 'string'},
+      'parent': {'$ref': 'Node'},
+      'children': {'type': 'array', 'items': {'$ref': 'Node'}}
+    }},
+    'Campaign': {'properties': {
+      'name': {'type': 'string'},
+      'budget': {'$ref': 'Money'},
+      'advertiser': {'$ref': 'Advertiser'}
+    }},
+    'Advertiser': {'properties': {
+      'id': {'type': 'string', 'format': 'int64'},
+      'campaigns': {'type': 'array', 'items': {'$ref': 'Campaign'}},
+      'balance': {'$ref': 'Money'}
+    }},
+    'Money': {'properties': {
+      'units': {'type': 'integer'},
+      'currency': {'type': 'string', 'enum': ['USD', 'EUR']}
+    }}
+  }}
+
+  def setUp(self):
+    # seed the process cache so the constructor never fetches
+    url = 'https://test.googleapis.com/$discovery/rest?version=v1&key=&labels='
+    DOCUMENT_CACHE[url] = self.DOCUMENT
+
+  def scalar(self, name, kind='STRING', description=''):
+    return {'description': description, 'name': name, 'type': kind, 'mode': 'NULLABLE'}
+
+  def record(self, name, fields, mode='NULLABLE'):
+    return {'name': name, 'type': 'RECORD', 'mode': mode, 'fields': fields}
+
+  def test_acyclic_refs(self):
+    """  Tests: acyclic_refs
+
+    Verify self and mutually recursive schemas are excluded, leaf schemas kept.
+    """
+
+    self.assertEqual(acyclic_refs(self.DOCUMENT['schemas']), {'Money'})
+
+  def test_to_schema_recursive(self):
+    """  Tests: to_schema, _ref_schema, _ref_key
+
+    Verify recursive references expand to the same schema the uncached
+    expansion produced, stopping at recursion depth, and that repeat calls
+    served from the cache return identical results.
+    """
+
+    money = [
+      self.scalar('currency', description='USD,EUR'),
+      self.scalar('units', 'INT64')
+    ]
+
+    discovery = Discovery_To_BigQuery('test', 'v1', recursion_depth=1, cache_dir=None)
+
+    self.assertEqual(discovery.resource_schema('Node'), [
+      self.record('children', [self.scalar('id')], 'REPEATED'),
+      self.scalar('id'),
+      self.record('parent', [self.scalar('id')])
+    ])
+
+    self.assertEqual(discovery.resource_schema('Campaign'), [
+      self.record('advertiser', [
+        self.record('balance', money),
+        self.record('campaigns', [
+          self.record('budget', money),
+          self.scalar('name')
+        ], 'REPEATED'),
+        self.scalar('id')
+      ]),
+      self.record('budget', money),
+      self.scalar('name')
+    ])
+
+    # cached expansions are shared, repeated and reversed calls must agree
+    discovery = Discovery_To_BigQuery('test', 'v1', recursion_depth=2, cache_dir=None)
+    advertiser = discovery.resource_schema('Advertiser')
+    campaign = discovery.resource_schema('Campaign')
+    self.assertEqual(discovery.resource_schema('Advertiser'), advertiser)
+
+    discovery = Discovery_To_BigQuery('test', 'v1', recursion_depth=2, cache_dir=None)
+    self.assertEqual(discovery.resource_schema('Campaign'), campaign)
+    self.assertEqual(discovery.resource_schema('Advertiser'), advertiser)